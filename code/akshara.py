@@ -0,0 +1,201 @@
+import unicodedata
+from types import MappingProxyType
+from typing import NamedTuple
+from striped_cache import StripedCache
+
+# --- CHARACTER CLASSES ---
+# Every code point in the Kannada block (U+0C80 - U+0CFF) gets one class.
+# The table is built once at import time so segmentation is a plain index lookup.
+OTHER, VOWEL, CONSONANT, MATRA, VIRAMA, YOGAVAHA, NUKTA, JOINER, DIGIT = range(9)
+
+KANNADA_START = 0x0C80
+KANNADA_END = 0x0CFF
+
+HALANT = '್'  # Virama: removes the inherent 'a' of a consonant
+ZWNJ = '\u200c'  # Zero width non-joiner (explicit halant form, e.g. ಮಹಲ್‌ಗೆ)
+ZWJ = '\u200d'   # Zero width joiner
+
+# Dependent vowel sign (Matra) -> Vowel sound (Swara)
+MATRA_TO_SWARA = {
+    'ಾ': 'ಆ',  # aa
+    'ಿ': 'ಇ',  # i
+    'ೀ': 'ಈ',  # ii
+    'ು': 'ಉ',  # u
+    'ೂ': 'ಊ',  # uu
+    'ೃ': 'ಋ',  # ru
+    'ೄ': 'ೠ',  # ruu
+    'ೆ': 'ಎ',  # e
+    'ೇ': 'ಏ',  # ee
+    'ೈ': 'ಐ',  # ai
+    'ೊ': 'ಒ',  # o
+    'ೋ': 'ಓ',  # oo
+    'ೌ': 'ಔ',  # au
+    'ೢ': 'ಌ',  # vocalic l
+    'ೣ': 'ೡ',  # vocalic ll
+}
+
+# Vowel sound (Swara) -> Dependent vowel sign (Matra); 'ಅ' is inherent
+SWARA_TO_MATRA = {swara: matra for matra, swara in MATRA_TO_SWARA.items()}
+SWARA_TO_MATRA['ಅ'] = ''
+
+def _build_class_table():
+    table = bytearray(KANNADA_END - KANNADA_START + 1)
+    for offset in range(len(table)):
+        char = chr(KANNADA_START + offset)
+        if char in MATRA_TO_SWARA:
+            table[offset] = MATRA
+        elif char == HALANT:
+            table[offset] = VIRAMA
+        elif char == '಼':
+            table[offset] = NUKTA
+        elif char in 'ಀಁಂಃೱೲೳ':
+            table[offset] = YOGAVAHA  # Anusvara, Visarga, Candrabindu, Jihvamuliya ...
+        elif unicodedata.category(char) in ('Mn', 'Mc'):
+            table[offset] = MATRA  # Length marks and other vowel signs
+        elif char.isdigit():
+            table[offset] = DIGIT
+        elif unicodedata.name(char, '').startswith('KANNADA LETTER'):
+            is_vowel = ('ಅ' <= char <= 'ಔ') or char in 'ೠೡ'
+            table[offset] = VOWEL if is_vowel else CONSONANT
+    return bytes(table)
+
+CHAR_CLASS = _build_class_table()
+
+# Classes that never start a new akshara on their own
+_COMBINING = frozenset({MATRA, VIRAMA, YOGAVAHA, NUKTA, JOINER})
+
+def char_class(char):
+    """Returns the character class of a single code point."""
+    code = ord(char)
+    if KANNADA_START <= code <= KANNADA_END:
+        return CHAR_CLASS[code - KANNADA_START]
+    if char == ZWNJ or char == ZWJ:
+        return JOINER
+    return OTHER
+
+def is_vowel(char):
+    """True for an independent vowel letter (ಅ, ಆ, ಇ ...)."""
+    return char_class(char) == VOWEL
+
+class Segmentation(NamedTuple):
+    bounds: bytes          # End offset of every akshara (tuple if the word is >= 256 chars)
+    first_swara: str       # First sound, same convention as KannadaWordBuilder._get_first_swara
+    last_swara: str        # Vowel of the last akshara, '್' for a dead consonant
+    last_consonant: str    # Base consonant of the last akshara ('' if it is a bare vowel)
+
+EMPTY = Segmentation(b'', '', '', '')
+
+def segment(word):
+    """
+    Splits a word into aksharas (grapheme clusters) in a single pass.
+    Conjuncts (ಕ್ಷ), nukta, anusvara/visarga and ZWJ/ZWNJ stay inside their cluster.
+    Returns: Segmentation(bounds, first_swara, last_swara, last_consonant)
+    """
+    if not word:
+        return EMPTY
+
+    bounds = []
+    after_virama = False  # Previous cluster character was a virama (or virama + ZWJ)
+    vowel = 'ಅ'           # Vowel of the akshara being scanned
+    consonant = ''        # Last base consonant of the akshara being scanned
+
+    for i, char in enumerate(word):
+        code = ord(char)
+        if KANNADA_START <= code <= KANNADA_END:
+            cls = CHAR_CLASS[code - KANNADA_START]
+        elif char == ZWNJ or char == ZWJ:
+            cls = JOINER
+        else:
+            cls = OTHER
+
+        # A consonant right after a virama continues the conjunct (ಕ್ಷ, ನ್ನ).
+        # ZWNJ after a virama forces the explicit halant form and closes the akshara.
+        conjunct = cls == CONSONANT and after_virama
+        if i and cls not in _COMBINING and not conjunct:
+            bounds.append(i)
+
+        if cls == CONSONANT:
+            consonant = char
+            vowel = 'ಅ'
+        elif cls == VOWEL:
+            consonant = ''
+            vowel = char
+        elif cls == MATRA:
+            vowel = MATRA_TO_SWARA.get(char, vowel)
+        elif cls == VIRAMA:
+            vowel = HALANT
+        elif cls == YOGAVAHA:
+            vowel = char
+        elif cls != JOINER:
+            consonant = ''
+            vowel = 'ಅ'
+
+        if cls == JOINER:
+            after_virama = after_virama and char == ZWJ
+        else:
+            after_virama = cls == VIRAMA
+
+    bounds.append(len(word))
+    packed = bytes(bounds) if len(word) < 256 else tuple(bounds)
+    return Segmentation(packed, word[0], vowel, consonant)
+
+def aksharas(word, bounds=None):
+    """Returns the list of aksharas of a word, e.g. ಕನ್ನಡ -> ['ಕ', 'ನ್ನ', 'ಡ']."""
+    if bounds is None:
+        bounds = segment(word).bounds
+    out = []
+    start = 0
+    for end in bounds:
+        out.append(word[start:end])
+        start = end
+    return out
+
+def strip_vowel_sign(word, bounds=None):
+    """
+    Drops the vowel sign (Matra or Halant) of the last akshara, keeping its consonant.
+    ಮನೆ -> ಮನ, ಹೊಸ್ -> ಹೊಸ, ಮಹಲ್‌ -> ಮಹಲ. Words ending in a bare consonant are unchanged.
+    """
+    if not word:
+        return word
+    if bounds is None:
+        bounds = segment(word).bounds
+    start = bounds[-2] if len(bounds) > 1 else 0
+    end = len(word)
+    # Trailing joiners belong to the halant form that is being removed
+    while end > start and char_class(word[end - 1]) == JOINER:
+        end -= 1
+    if end > start and char_class(word[end - 1]) in (MATRA, VIRAMA):
+        return word[:end - 1]
+    return word
+
+class AksharaSegmenter:
+    def __init__(self, lexicon=(), cache_size=65536):
+        """
+        Pre-segments every lexicon word once (read-only afterwards); other words
+        go through a bounded, lock-striped cache so concurrent callers stay safe.
+        """
+        self.cache = MappingProxyType({word: segment(word) for word in lexicon})
+        self.extra = StripedCache(cache_size)
+
+    def analyse(self, word):
+        """Returns the cached Segmentation of a word (computed if not in the lexicon)."""
+        seg = self.cache.get(word)
+        if seg is None:
+            seg = self.extra.get_or_compute(word, segment)
+        return seg
+
+    def aksharas(self, word):
+        return aksharas(word, self.analyse(word).bounds)
+
+    def length(self, word):
+        """Number of aksharas in a word."""
+        return len(self.analyse(word).bounds)
+
+    def last_swara(self, word):
+        return self.analyse(word).last_swara
+
+    def first_swara(self, word):
+        return self.analyse(word).first_swara
+
+    def strip_vowel_sign(self, word):
+        return strip_vowel_sign(word, self.analyse(word).bounds)
@@ -2,9 +2,15 @@
 import streamlit as st
 import os
 import sys
+import time
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from word_joiner import KannadaWordBuilder
+from text_normalizer import normalize_input
+from word_joiner import KannadaWordBuilder, dictionary_version
+from rerun_timer import RerunTimer
+from batch_joiner import BatchJob, OUTPUT_HEADERS, read_pairs
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'app.css')
 
 # --- CONFIG ---
 st.set_page_config(
@@ -12,95 +18,66 @@ st.set_page_config(
     page_icon="✍️",
     layout="wide",
 )
+run_started = time.perf_counter()
 
 # --- LOAD SYSTEM ---
-@st.cache_resource
-def load_system():
-    return KannadaWordBuilder()
-
-builder = load_system()
-
-# --- CSS (no HTML wrappers for widgets) ---
-st.markdown(
-    """
-    <style>
-    /* page container width */
-    .block-container {
-        max-width: 920px;
-        padding-top: 1.2rem;
-        padding-bottom: 2rem;
-    }
+# Keyed by the dictionary version (file sizes / mtimes): edited CSVs load a fresh builder
+@st.cache_resource(max_entries=1)
+def load_system(version):
+    shared_path = os.environ.get("KWB_SHARED_LEXICON")
+    if shared_path:
+        # Workers map one published copy of the lexicon instead of each loading their own
+        from shared_lexicon import attach_builder
+        builder = attach_builder(shared_path)
+    else:
+        builder = KannadaWordBuilder()
+    cache_path = os.environ.get("KWB_JOIN_CACHE")
+    if cache_path:
+        # Optional persistent join cache shared by all app workers / restarts
+        from join_cache import CachedJoiner
+        builder = CachedJoiner.open(builder, cache_path)
+    return builder
 
-    /* a "card" appearance by targeting Streamlit container/blocks */
-    /* We target the generic vertical block that Streamlit creates for containers/columns.
-       These selectors are reasonably stable across Streamlit versions. */
-    .stApp > div > div > section .stBlock > div[role="region"] {
-        background: #11151b;
-        border-radius: 12px;
-        padding: 0 22px;
-        border: 1px solid #222831;
-        box-shadow: 0 6px 18px rgba(0,0,0,0.35);
-    }
-
-    /* make text inputs visually card-like */
-    .stTextInput > div > div > input {
-        background-color: #1f2430 !important;
-        color: #e6eef8 !important;
-        border-radius: 10px !important;
-        padding: 0 12px !important;
+@st.cache_resource
+def load_timer():
+    return RerunTimer()
+
+@st.cache_data(max_entries=4)
+def dictionary_stats(version):
+    # Computed once per dictionary version, not on every rerun
+    return {
+        "words": len(builder.root_words),
+        "rules": len(builder.sandhi_rules) + len(builder.samasa_rules),
+        "markers": len(builder.vibhakti_markers),
     }
 
-    .center-btn {
-    display: flex;
-    justify-content: center;
-}
-
-    /* button style */
-    .stButton > button {
-        background-color: #ef4444 !important;
-        color: white !important;
-        padding: 0px 22px !important;     
-        border-radius: 10px !important;
-        font-weight: 600;
-        border: none !important;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-    }
+dict_version = dictionary_version(KannadaWordBuilder.default_dict_dir())
+builder = load_system(dict_version)
+timer = load_timer()
 
-    /* sidebar bg */
-    section[data-testid="stSidebar"] {
-        background-color: #0f1520;
-        padding: 5px;
-    }
+# --- CACHED LOOKUPS (not recomputed on every rerun / keystroke) ---
+# The dictionary version is part of the key, so a reloaded builder never serves stale results
+@st.cache_data(max_entries=10000)
+def lookup_hint(word1, version):
+    hints = builder.hint_engine.get_hints(word1)
+    return hints[0] if hints else None
 
-    /* success/result area */
-    .stAlert {
-        border-radius: 10px;
-        padding: 5px;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-    }
+@st.cache_data(max_entries=10000)
+def join_pair(word1, word2, version, profile=None):
+    return builder.join_words(word1, word2, profile=profile)
 
-    /* caption/hint */
-    .stCaption {
-        color: #aab6c9;
-    }
+# --- CSS (no HTML wrappers for widgets) ---
+# Served as a static file (.streamlit/config.toml): every full rerun re-sends one <link> line,
+# and the browser keeps the stylesheet cached. Without static serving it is inlined as before.
+@st.cache_resource
+def load_css():
+    with open(CSS_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
 
-    /* Center footer */
-.footer {
-    text-align: center;
-    opacity: 0.7;
-    font-size: 0.9rem;
-}
-
-    /* small spacing tweaks */
-    .css-1d391kg { margin-bottom: 8px; } /* form label -> small tweak */
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<link rel="stylesheet" href="app/static/app.css">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # --- HEADER ---
 st.markdown("<h1 style='text-align:center;margin-bottom:0.2rem;'>✍️ Kannada Word Builder</h1>", unsafe_allow_html=True)
@@ -111,58 +88,139 @@ st.markdown("<p style='text-align:center;color:#9CA3AF;margin-top:0;'>AI-Powered
 # SIDEBAR
 # -------------------------------
 with st.sidebar:
+    stats = dictionary_stats(dict_version)
     st.markdown("## 📊 System Stats")
-    st.write(f"**Dictionary Size:** {len(builder.root_words)} words")
-    st.write(f"**Rules:** {len(builder.sandhi_rules) + len(builder.samasa_rules)}")
-    st.write(f"**Case Markers:** {len(builder.vibhakti_markers)}")
+    st.write(f"**Dictionary Size:** {stats['words']} words")
+    st.write(f"**Rules:** {stats['rules']}")
+    st.write(f"**Case Markers:** {stats['markers']}")
+    if len(builder.profile_names) > 1:
+        st.selectbox("Rule Profile", builder.profile_names, key="profile")
     st.markdown("---")
     st.success("Ready for Multimodal AI Hackathon 🚀")
+    with st.expander("⏱ Rerun Timing (server)"):
+        for kind, row in timer.summary().items():
+            st.caption(f"**{kind}**: {row['runs']} runs • p50 {row['p50_ms']} ms • p95 {row['p95_ms']} ms • max {row['max_ms']} ms")
 
 # --------------------------------
-# INPUT AREA (no raw HTML wrappers)
+# JOIN SECTION (fragment: typing or clicking here reruns only this part of the page)
 # --------------------------------
-# Use a container so all widgets are in one Streamlit block (so the CSS card targets them together)
-left_col, right_col, btn_col = st.columns([1.1, 1.1, 1.1], gap="small")
-
-with left_col:
-    word1 = st.text_input("Enter Word 1 (Root):", placeholder="e.g., ಮಹಾ").strip()
-    if word1 and hasattr(builder, "hint_engine"):
-        hints = builder.hint_engine.get_hints(word1)
-        if hints:
-            st.caption(f"💡 Hint: Try **{hints[0]['next_word']}** → {hints[0]['result']}")
-
-with right_col:
-    word2 = st.text_input("Enter Word 2 (Suffix):", placeholder="e.g., ಆತ್ಮ / ಅಲ್ಲಿ").strip()
-
-with btn_col:
-    st.markdown("<div style='height:27px'></div>", unsafe_allow_html=True)  # vertical align
-    combine_btn = st.button("🚀 Combine Words", use_container_width=True)
-
+@st.fragment
+def join_section():
+    with timer.measure("fragment:join"):
+        render_join()
+
+def render_join():
+    # --------------------------------
+    # INPUT AREA (no raw HTML wrappers)
+    # --------------------------------
+    # Use a container so all widgets are in one Streamlit block (so the CSS card targets them together)
+    left_col, right_col, btn_col = st.columns([1.1, 1.1, 1.1], gap="small")
+
+    with left_col:
+        word1 = normalize_input(st.text_input("Enter Word 1 (Root):", placeholder="e.g., ಮಹಾ"))
+        if word1 and hasattr(builder, "hint_engine"):
+            hint = lookup_hint(word1, dict_version)
+            if hint:
+                st.caption(f"💡 Hint: Try **{hint['next_word']}** → {hint['result']}")
+
+    with right_col:
+        word2 = normalize_input(st.text_input("Enter Word 2 (Suffix):", placeholder="e.g., ಆತ್ಮ / ಅಲ್ಲಿ"))
+
+    with btn_col:
+        st.markdown("<div style='height:27px'></div>", unsafe_allow_html=True)  # vertical align
+        combine_btn = st.button("🚀 Combine Words", use_container_width=True)
+
+
+    # --------------------------------
+    # RESULT AREA
+    # --------------------------------
+    if combine_btn:
+        # Keep the result UI within a single Streamlit container block
+        with st.container():
+            if not word1 or not word2:
+                st.warning("Please enter both words.")
+            else:
+                output = join_pair(word1, word2, dict_version, st.session_state.get("profile"))
+
+                if output.get("status") == "success":
+                    st.success(f"✔ Result: **{output['result']}**")
+                    with st.expander("🔍 Rule Explanation", expanded=True):
+                        st.write(f"**Rule Applied:** {output.get('rule', '—')}") 
+                        st.markdown(f"**{word1} + {word2} → {output['result']}**")
+                        validation = output.get("validation")
+                        if validation:
+                            known = "known word" if validation["result_known"] else "not in dictionary"
+                            st.caption(f"📖 Lexicon check: {known} • confidence: {validation['confidence']}")
+                elif output.get("status") == "error":
+                    st.error(f"❌ Error: {output.get('msg', 'Unknown error')}")
+                else:
+                    st.warning(output.get("msg", "Unexpected output"))
+                    st.write(f"**Result:** {output.get('result', '')}")
+
+join_section()
 
 # --------------------------------
-# RESULT AREA
+# BATCH MODE (CSV upload, joined in a background thread)
 # --------------------------------
-if combine_btn:
-    # Keep the result UI within a single Streamlit container block
-    with st.container():
-        if not word1 or not word2:
-            st.warning("Please enter both words.")
+def batch_progress():
+    # Only this fragment reruns, and only while a job is running; otherwise it is drawn once
+    job = st.session_state.get("batch_job")
+    polling = job is not None and job.running
+    st.fragment(run_every=1.0 if polling else None)(batch_view)(polling)
+
+def batch_view(polling):
+    job = st.session_state.get("batch_job")
+    if job is None:
+        return
+    if polling and not job.running:
+        # Finished since polling started: one full rerun redraws it without the timer
+        st.rerun()
+
+    state = "Running" if job.running else ("Cancelled" if job.cancelled else "Finished")
+    st.progress(job.progress, text=f"{state}: {job.done}/{job.total} pairs")
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Joined", f"{job.done}")
+    m2.metric("Throughput", f"{job.throughput:.0f} pairs/s")
+    m3.metric("Errors", f"{job.errors}")
+
+    rows = job.snapshot()
+    st.dataframe([dict(zip(OUTPUT_HEADERS, row)) for row in rows[-500:]], use_container_width=True)
+
+    if not job.running:
+        st.download_button(
+            "⬇️ Download Results",
+            data=job.to_csv(),
+            file_name="joined_pairs.csv",
+            mime="text/csv",
+        )
+
+with st.expander("📄 Batch Mode (CSV upload)"):
+    st.caption("Upload a CSV with `word1`,`word2` columns (or two unnamed columns).")
+    uploaded = st.file_uploader("Word pairs CSV", type=["csv"])
+    start_col, stop_col = st.columns(2)
+    job = st.session_state.get("batch_job")
+
+    with start_col:
+        start_btn = st.button("▶️ Start Batch", use_container_width=True, disabled=uploaded is None)
+    with stop_col:
+        if st.button("⏹ Cancel", use_container_width=True, disabled=job is None or not job.running):
+            job.cancel()
+
+    if start_btn and uploaded is not None:
+        if job is not None and job.running:
+            job.cancel()
+        pairs = read_pairs(uploaded.getvalue())
+        if pairs:
+            st.session_state["batch_job"] = BatchJob(builder, pairs, st.session_state.get("profile")).start()
         else:
-            output = builder.join_words(word1, word2)
-
-            if output.get("status") == "success":
-                st.success(f"✔ Result: **{output['result']}**")
-                with st.expander("🔍 Rule Explanation", expanded=True):
-                    st.write(f"**Rule Applied:** {output.get('rule', '—')}") 
-                    st.markdown(f"**{word1} + {word2} → {output['result']}**")
-            elif output.get("status") == "error":
-                st.error(f"❌ Error: {output.get('msg', 'Unknown error')}")
-            else:
-                st.warning(output.get("msg", "Unexpected output"))
-                st.write(f"**Result:** {output.get('result', '')}")
+            st.warning("No word pairs found in the uploaded file.")
+
+    batch_progress()
 
 st.markdown("""
 <div class='footer'>
 Team Project for Modalapada Hackathon • Built with ❤️
 </div>
 """, unsafe_allow_html=True)
+
+timer.record("full", time.perf_counter() - run_started)
@@ -0,0 +1,174 @@
+import csv
+import io
+import os
+import sys
+import threading
+import time
+from text_normalizer import normalize_input
+from word_joiner import KannadaWordBuilder
+
+# Columns of the downloadable / written result file
+OUTPUT_HEADERS = ["word1", "word2", "result", "status", "rule", "confidence"]
+
+def read_pairs(source):
+    """
+    Reads (word1, word2) pairs from CSV text, bytes or a file object.
+    Uses the 'word1'/'word2' columns when present (e.g. word_pairs_test.csv),
+    otherwise the first two columns.
+    """
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig')
+    source = source.lstrip('\ufeff')
+
+    rows = list(csv.reader(io.StringIO(source)))
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'word1' in header and 'word2' in header:
+        i1, i2 = header.index('word1'), header.index('word2')
+        rows = rows[1:]
+    else:
+        i1, i2 = 0, 1
+
+    pairs = []
+    for row in rows:
+        if len(row) > max(i1, i2):
+            word1, word2 = normalize_input(row[i1]), normalize_input(row[i2])
+            if word1 and word2:
+                pairs.append((word1, word2))
+    return pairs
+
+def result_row(word1, word2, output):
+    """Flattens a join_words() output into one OUTPUT_HEADERS row."""
+    validation = output.get('validation') or {}
+    return [
+        word1,
+        word2,
+        output.get('result', ''),
+        output.get('status', ''),
+        output.get('rule') or output.get('msg', ''),
+        validation.get('confidence', ''),
+    ]
+
+def rows_to_csv(rows):
+    """Serializes result rows to UTF-8 CSV bytes (with BOM, like the dictionary files)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(OUTPUT_HEADERS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8-sig')
+
+class BatchJob:
+    def __init__(self, builder, pairs, profile=None):
+        """
+        Runs builder.join_words over many pairs (with the given rule profile) in a background thread.
+        Results are appended as they are produced so callers can stream them.
+        """
+        self.builder = builder
+        self.pairs = list(pairs)
+        self.profile = profile
+        self.results = []
+        self.errors = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._stop.set()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        for word1, word2 in self.pairs:
+            if self._stop.is_set():
+                break
+            try:
+                row = result_row(word1, word2, self.builder.join_words(word1, word2, profile=self.profile))
+            except Exception as e:
+                row = [word1, word2, '', 'error', str(e), '']
+                self.errors += 1
+            with self._lock:
+                self.results.append(row)
+        self.finished_at = time.perf_counter()
+
+    # --- PROGRESS ---
+    @property
+    def total(self):
+        return len(self.pairs)
+
+    @property
+    def done(self):
+        return len(self.results)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._stop.is_set()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def throughput(self):
+        """Pairs joined per second so far."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self):
+        """Copy of the results produced so far."""
+        with self._lock:
+            return list(self.results)
+
+    def to_csv(self):
+        return rows_to_csv(self.snapshot())
+
+def run_batch(input_path, output_path, cache_path=None):
+    with open(input_path, 'r', encoding='utf-8-sig') as f:
+        pairs = read_pairs(f)
+    print(f"--- Batch joining {len(pairs)} pairs ---")
+
+    builder = KannadaWordBuilder()
+    if cache_path:
+        # Persistent results from earlier runs with the same dictionaries/rules
+        from join_cache import CachedJoiner
+        builder = CachedJoiner.open(builder, cache_path)
+
+    job = BatchJob(builder, pairs).start()
+    while job.running:
+        job.wait(1.0)
+        print(f"   ... {job.done}/{job.total} ({job.throughput:.0f} pairs/s)")
+    if cache_path:
+        builder.cache.close()
+        print(f"   Cache: {builder.cache.hits} hits, {builder.cache.misses} misses")
+
+    with open(output_path, 'wb') as f:
+        f.write(job.to_csv())
+    print(f"✅ Wrote {job.done} results to {output_path} in {job.elapsed:.2f}s ({job.errors} errors)")
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print(f"Usage: python {os.path.basename(__file__)} <pairs.csv> <results.csv> [join_cache.sqlite]")
+        sys.exit(1)
+    run_batch(*sys.argv[1:])
@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+from word_joiner import KannadaWordBuilder
+
+def gil_enabled():
+    """True on a normal build; False on free-threaded CPython running with the GIL off."""
+    check = getattr(sys, '_is_gil_enabled', None)
+    return check() if check else True
+
+def make_workload(builder, count, seed=7):
+    """Random root pairs; every third pair joins a root with a case marker instead."""
+    rng = random.Random(seed)
+    words = list(builder.root_words.keys())
+    markers = list(builder.vibhakti_markers.keys())
+    pairs = []
+    for i in range(count):
+        word2 = rng.choice(markers) if i % 3 == 0 else rng.choice(words)
+        pairs.append((rng.choice(words), word2))
+    return pairs
+
+def run_threads(builder, pairs, threads, expected):
+    """Every thread joins the full pair list; returns (seconds, mismatches)."""
+    barrier = threading.Barrier(threads + 1)
+    mismatches = [0] * threads
+
+    def worker(slot):
+        barrier.wait()
+        bad = 0
+        for (word1, word2), want in zip(pairs, expected):
+            if builder.join_words(word1, word2)['result'] != want:
+                bad += 1
+        mismatches[slot] = bad
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - started, sum(mismatches)
+
+def benchmark(thread_counts, pairs_per_thread):
+    builder = KannadaWordBuilder()
+    pairs = make_workload(builder, pairs_per_thread)
+    expected = [builder.join_words(w1, w2)['result'] for w1, w2 in pairs]  # Single-thread reference + warm-up
+
+    results = []
+    base_rate = None
+    for threads in thread_counts:
+        seconds, mismatches = run_threads(builder, pairs, threads, expected)
+        rate = threads * len(pairs) / seconds
+        base_rate = base_rate or rate / threads
+        results.append({
+            'threads': threads,
+            'seconds': round(seconds, 3),
+            'joins_per_sec': round(rate),
+            'speedup': round(rate / base_rate, 2),
+            'efficiency': round(rate / base_rate / threads, 2),
+            'mismatches': mismatches,
+        })
+        print(f"   {threads:>3} threads: {rate:>10.0f} joins/s  speedup x{rate / base_rate:.2f}  mismatches={mismatches}")
+
+    return {
+        'python': sys.version.split()[0],
+        'free_threaded_build': bool(sysconfig.get_config_var('Py_GIL_DISABLED')),
+        'gil_enabled': gil_enabled(),
+        'cpus': os.cpu_count(),
+        'pairs_per_thread': pairs_per_thread,
+        'results': results,
+    }
+
+def compare(interpreters, args):
+    """Runs this benchmark under several interpreters (e.g. python3.13 and python3.13t)."""
+    reports = []
+    for interpreter in interpreters:
+        cmd = [interpreter, os.path.abspath(__file__), '--json', '--pairs', str(args.pairs),
+               '--threads', *[str(t) for t in args.threads]]
+        print(f"--- {interpreter} ---")
+        out = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
+        if out.returncode != 0:
+            print(f"❌ {interpreter} failed: {out.stderr.strip().splitlines()[-1:]}")
+            continue
+        report = json.loads(out.stdout.strip().splitlines()[-1])
+        report['interpreter'] = interpreter
+        reports.append(report)
+        for row in report['results']:
+            print(f"   {row['threads']:>3} threads: {row['joins_per_sec']:>10} joins/s  speedup x{row['speedup']}")
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Hammer join_words from N threads and report scaling.")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--pairs', type=int, default=20000, help="Joins per thread")
+    parser.add_argument('--compare', nargs='+', metavar='PYTHON',
+                        help="Run under these interpreters, e.g. --compare python3.13 python3.13t")
+    parser.add_argument('--json', action='store_true', help="Print only the JSON report")
+    args = parser.parse_args()
+
+    if args.compare:
+        print(json.dumps(compare(args.compare, args), indent=2))
+        return
+
+    if args.json:
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    else:
+        print(f"--- 🧵 Concurrency benchmark (Python {sys.version.split()[0]}, GIL {'on' if gil_enabled() else 'off'}) ---")
+    report = benchmark(args.threads, args.pairs)
+    if args.json:
+        sys.stdout = sys.__stdout__
+        print(json.dumps(report))
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
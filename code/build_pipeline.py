@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, NamedTuple, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_DIR = os.path.join(BASE_DIR, 'build')
+MANIFEST_PATH = os.path.join(BUILD_DIR, 'manifest.json')
+
+COMPOUND_SEED = 2500  # Fixed seed: the same inputs always give the same compound_words.csv
+
+# Inputs shared by every step that runs the joiner (paths relative to the repo root)
+DICTIONARY_SOURCES = (
+    'dictionaries/root_words.csv',
+    'dictionaries/sandhi_rules.csv',
+    'dictionaries/vibhakti_rules.csv',
+    'dictionaries/samasa_rules.csv',
+)
+RULE_MODULES = ('code/word_joiner.py', 'code/akshara.py', 'code/text_normalizer.py')
+# The clean step's copy of the dictionaries (junk rows removed): every step that only
+# consumes the lexicon reads this folder, not dictionaries/
+CLEAN_DIR = 'build/clean_dictionaries'
+CLEAN_SOURCES = tuple(f"{CLEAN_DIR}/{os.path.basename(path)}" for path in DICTIONARY_SOURCES)
+CLEAN_COMPOUNDS = f"{CLEAN_DIR}/compound_words.csv"
+# Step outputs that are committed source data: never regenerated just because no manifest exists yet
+TRACKED_OUTPUTS = ('dictionaries/compound_words.csv', 'test cases/word_pairs_test.csv')
+
+# --- STEP ACTIONS (top level, so they can run in worker processes) ---
+def build_compounds(root):
+    from generate_data import generate_massive_data
+    generate_massive_data(root, seed=COMPOUND_SEED, write_tests=False)
+
+def build_compound_index(root):
+    from compound_store import build_store
+    build_store(os.path.join(root, CLEAN_COMPOUNDS), os.path.join(root, CLEAN_DIR, 'compound_words.idx'))
+
+def build_tests(root):
+    from populate_tests import populate_test_csv
+    populate_test_csv(root)
+
+def build_snapshot(root):
+    from batch_joiner import OUTPUT_HEADERS, result_row
+    from regression_diff import iter_pairs
+    from word_joiner import KannadaWordBuilder
+    builder = KannadaWordBuilder(os.path.join(root, CLEAN_DIR))
+    pairs = iter_pairs(os.path.join(root, 'test cases', 'word_pairs_test.csv'))
+    _write_csv(os.path.join(root, 'build', 'join_snapshot.csv'), OUTPUT_HEADERS,
+               (result_row(w1, w2, builder.join_words(w1, w2)) for w1, w2 in pairs))
+
+def build_paradigms(root):
+    from word_joiner import KannadaWordBuilder
+    builder = KannadaWordBuilder(os.path.join(root, CLEAN_DIR))
+    rows = (
+        [paradigm['word'], form['marker'], form['result'], form['rule']]
+        for paradigm in builder.decline_many()
+        for form in paradigm['forms']
+    )
+    _write_csv(os.path.join(root, 'build', 'paradigms.csv'), ["word", "marker", "result", "rule"], rows)
+
+def build_fst(root):
+    from lexicon_fst import LexiconFST, compile_fst, verify
+    from word_joiner import KannadaWordBuilder
+    builder = KannadaWordBuilder(os.path.join(root, CLEAN_DIR))
+    path = os.path.join(root, 'build', 'lexicon.fst')
+    compile_fst(builder, path)
+    # Every root x marker must come out as join_words() gives it; a drifted FST is not kept
+    fst = LexiconFST(path)
+    report = verify(fst, builder)
+    fst.close()
+    mismatches = report['mismatches']
+    if mismatches:
+        os.remove(path)
+        word, marker, expected, got = mismatches[0]
+        raise ValueError(f"{len(mismatches)}/{report['checked']} FST forms differ from join_words "
+                         f"(e.g. {word} + {marker}: expected {expected}, got {got})")
+    print(f"Verified {report['checked']} root x marker forms")
+
+def build_clean(root):
+    from clean_dictionaries import clean_dictionaries
+    reports = clean_dictionaries(os.path.join(root, 'dictionaries'), os.path.join(root, CLEAN_DIR))
+    with open(os.path.join(root, 'build', 'clean_report.json'), 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
+
+def _write_csv(path, headers, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+# --- DEPENDENCY GRAPH ---
+class Step(NamedTuple):
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    action: Callable
+
+# Generators write the committed dictionaries/ and test cases/ data; clean turns dictionaries/
+# into CLEAN_DIR, which the index, snapshot, paradigm and FST steps read
+STEPS = (
+    Step('compounds', DICTIONARY_SOURCES + RULE_MODULES + ('code/generate_data.py',),
+         ('dictionaries/compound_words.csv',), build_compounds),
+    Step('tests', DICTIONARY_SOURCES + RULE_MODULES + ('code/populate_tests.py', 'code/lexicon_features.py'),
+         ('test cases/word_pairs_test.csv',), build_tests),
+    Step('clean', DICTIONARY_SOURCES + ('dictionaries/compound_words.csv', 'code/clean_dictionaries.py', 'code/text_normalizer.py'),
+         CLEAN_SOURCES + (CLEAN_COMPOUNDS, 'build/clean_report.json'), build_clean),
+    Step('compound_index', (CLEAN_COMPOUNDS, 'code/compound_store.py', 'code/word_validator.py', 'code/text_normalizer.py'),
+         (f"{CLEAN_DIR}/compound_words.idx",), build_compound_index),
+    # Snapshot confidence comes from compound membership, so the compound table (and its index) are inputs too
+    Step('snapshot', ('test cases/word_pairs_test.csv', CLEAN_COMPOUNDS, f"{CLEAN_DIR}/compound_words.idx") + CLEAN_SOURCES +
+         RULE_MODULES + ('code/batch_joiner.py', 'code/word_validator.py', 'code/compound_store.py'),
+         ('build/join_snapshot.csv',), build_snapshot),
+    Step('paradigms', CLEAN_SOURCES + RULE_MODULES,
+         ('build/paradigms.csv',), build_paradigms),
+    Step('fst', CLEAN_SOURCES + RULE_MODULES + ('code/lexicon_fst.py',),
+         ('build/lexicon.fst',), build_fst),
+)
+
+def upstream(step, steps=STEPS):
+    """Steps that produce one of this step's inputs."""
+    return [other.name for other in steps if other is not step and set(other.outputs) & set(step.inputs)]
+
+def select_steps(targets, steps=STEPS):
+    """The requested steps plus everything they depend on, in declaration order."""
+    if not targets:
+        return list(steps)
+    by_name = {step.name: step for step in steps}
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown steps: {', '.join(sorted(unknown))}")
+    wanted, stack = set(), list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(upstream(by_name[name], steps))
+    return [step for step in steps if step.name in wanted]
+
+# --- CONTENT HASHES ---
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_files(root, paths):
+    return {path: file_hash(os.path.join(root, path)) for path in paths}
+
+def load_manifest(path=MANIFEST_PATH):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def stale_reasons(step, record, root):
+    """Why a step must rerun (empty list = up to date)."""
+    if not record:
+        return ["never built"]
+    reasons = []
+    for path, digest in hash_files(root, step.inputs).items():
+        if record['inputs'].get(path) != digest:
+            reasons.append(f"input changed: {path}")
+    for path, digest in hash_files(root, step.outputs).items():
+        if digest is None:
+            reasons.append(f"output missing: {path}")
+        elif record['outputs'].get(path) != digest:
+            reasons.append(f"output edited: {path}")
+    return reasons
+
+def keeps_checked_in(step, record, root):
+    """
+    True for a never-recorded step whose outputs include committed data that already
+    exists (fresh checkout): those files are adopted, only --force regenerates them.
+    """
+    return (not record and any(path in TRACKED_OUTPUTS for path in step.outputs)
+            and all(os.path.exists(os.path.join(root, path)) for path in step.outputs))
+
+# --- EXECUTION ---
+def _run_step(name, root):
+    """Worker entry point: runs one step with its output captured to build/logs/<step>.log."""
+    step = next(step for step in STEPS if step.name == name)
+    log_dir = os.path.join(root, 'build', 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    started = time.perf_counter()
+    with open(os.path.join(log_dir, f"{name}.log"), 'w', encoding='utf-8') as log, \
+         contextlib.redirect_stdout(log):
+        step.action(root)
+    return time.perf_counter() - started
+
+def build(targets=None, jobs=None, force=False, dry_run=False, adopt=False, root=BASE_DIR):
+    """
+    Reruns only stale steps. A step is stale when the content hash of an input differs
+    from the one recorded at its last build, or an output is missing/edited.
+    Independent steps run in parallel; a step is checked only after its upstream steps
+    finished, so an upstream rebuild that produces identical bytes stops there.
+    Steps that write committed data (TRACKED_OUTPUTS) adopt the existing files when they
+    have no manifest record yet; force=True regenerates them.
+    Returns: {step: 'built' | 'up to date' | 'would build' | 'adopted' | 'failed' | 'skipped'}
+    """
+    manifest_path = os.path.join(root, 'build', 'manifest.json')
+    manifest = load_manifest(manifest_path)
+    steps = select_steps(targets)
+    pending = {step.name: step for step in steps}
+    deps = {step.name: upstream(step, steps) for step in steps}
+    status = {}
+    running = {}
+
+    def record(step, seconds):
+        manifest[step.name] = {
+            'inputs': hash_files(root, step.inputs),
+            'outputs': hash_files(root, step.outputs),
+            'seconds': round(seconds, 3),
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        save_manifest(manifest, manifest_path)
+
+    with ProcessPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                busy = {step.name for step in running.values()}
+                if any(d in pending or d in busy for d in deps[name]):
+                    continue
+                step = pending.pop(name)
+                if any(status.get(d) == 'failed' for d in deps[name]):
+                    status[name] = 'skipped'
+                    print(f"   ⏭  {name}: upstream failed")
+                    continue
+                reasons = ["forced"] if force else stale_reasons(step, manifest.get(name), root)
+                if not reasons:
+                    status[name] = 'up to date'
+                    print(f"   ✅ {name}: up to date")
+                elif adopt:
+                    record(step, 0.0)
+                    status[name] = 'adopted'
+                    print(f"   📌 {name}: recorded current files as built")
+                elif not force and keeps_checked_in(step, manifest.get(name), root):
+                    if not dry_run:
+                        record(step, 0.0)
+                    status[name] = 'adopted'
+                    print(f"   📌 {name}: kept the checked-in {', '.join(step.outputs)} (--force to regenerate)")
+                elif dry_run:
+                    # Upstream steps are assumed to change their outputs
+                    status[name] = 'would build'
+                    print(f"   🔁 {name}: {'; '.join(reasons)}")
+                else:
+                    print(f"   🔨 {name}: {'; '.join(reasons)}")
+                    running[pool.submit(_run_step, name, root)] = step
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    status[step.name] = 'failed'
+                    print(f"   ❌ {step.name}: {type(e).__name__}: {e}")
+                    continue
+                record(step, seconds)
+                status[step.name] = 'built'
+                print(f"   ✔  {step.name}: built in {seconds:.2f}s")
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stale derived data (compounds, tests, snapshots, tables, FST).")
+    parser.add_argument('targets', nargs='*', help=f"Steps to bring up to date (default: all of {', '.join(s.name for s in STEPS)})")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Parallel steps (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if up to date")
+    parser.add_argument('--dry-run', action='store_true', help="Only show what is stale and why")
+    parser.add_argument('--adopt', action='store_true',
+                        help="Record the current files as built without running anything (first use on existing data)")
+    args = parser.parse_args()
+
+    print("--- 🧱 Build pipeline ---")
+    try:
+        status = build(args.targets, args.jobs, args.force, args.dry_run, args.adopt)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    if 'failed' in status.values():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from akshara import aksharas
+
+try:
+    # Optional: C++ matrix scorer with the same WRatio semantics as fuzzywuzzy
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process, utils as rf_utils
+except ImportError:
+    rf_process = None
+
+HAS_RAPIDFUZZ = rf_process is not None
+
+SCORE_CUTOFF = 70     # Same filter as FuzzyMatcher.get_suggestions: keep scores > 70
+QUERY_CHUNK = 2048    # Rows of the score matrix computed at once (bounds memory)
+
+# --- NUMPY AKSHARA-DISTANCE KERNEL ---
+class AksharaIndex:
+    def __init__(self, words):
+        """
+        Lexicon encoded as akshara-id arrays, bucketed by akshara length.
+        Score = 100 * (1 - levenshtein / max(len)) over aksharas, so a bucket whose
+        length differs by more than 30% can never score > 70 and is skipped entirely.
+        """
+        self.words = list(words)
+        self.vocab = {}
+        by_length = {}
+        for i, word in enumerate(self.words):
+            codes = [self.vocab.setdefault(a, len(self.vocab)) for a in aksharas(word)]
+            by_length.setdefault(len(codes), ([], []))
+            by_length[len(codes)][0].append(i)
+            by_length[len(codes)][1].append(codes)
+        self.buckets = {
+            length: (np.array(ids, dtype=np.int32), np.array(codes, dtype=np.int32).reshape(len(ids), length))
+            for length, (ids, codes) in by_length.items()
+        }
+
+    def encode(self, word):
+        # Aksharas missing from the lexicon get -1, which never matches a lexicon akshara
+        return np.array([self.vocab.get(a, -1) for a in aksharas(word)], dtype=np.int32)
+
+    @staticmethod
+    def _distances(query, block):
+        """Levenshtein distance from one query to every row of block (n x L), row-vectorized."""
+        n, length = block.shape
+        steps = np.arange(length + 1, dtype=np.int32)
+        prev = np.broadcast_to(steps, (n, length + 1))
+        for i, code in enumerate(query, start=1):
+            # Substitution / deletion first, then the insertion chain as a running minimum
+            best = np.minimum(prev[:, 1:] + 1, prev[:, :-1] + (block != code))
+            chain = np.empty((n, length + 1), dtype=np.int32)
+            chain[:, 0] = i
+            chain[:, 1:] = best - steps[1:]
+            prev = np.minimum.accumulate(chain, axis=1) + steps
+        return prev[:, -1]
+
+    def top_k(self, word, limit=3, cutoff=SCORE_CUTOFF):
+        query = self.encode(word)
+        q_len = len(query)
+        if q_len == 0:
+            return []
+        ids, scores = [], []
+        for length, (bucket_ids, block) in self.buckets.items():
+            longest = max(q_len, length)
+            if abs(q_len - length) * 100 >= (100 - cutoff) * longest:
+                continue  # Impossible: the length gap alone costs more than the cutoff allows
+            score = 100 - (self._distances(query, block) * 100 + longest - 1) // longest
+            keep = score > cutoff
+            ids.append(bucket_ids[keep])
+            scores.append(score[keep])
+        if not ids:
+            return []
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        order = np.lexsort((ids, -scores))[:limit]
+        return [(self.words[ids[i]], int(scores[i])) for i in order]
+
+_worker_index = None
+
+def _init_kernel_worker(words):
+    global _worker_index
+    _worker_index = AksharaIndex(words)
+
+def _kernel_chunk(args):
+    queries, limit = args
+    return [_worker_index.top_k(q, limit) for q in queries]
+
+# --- BULK API ---
+def _rapidfuzz_top_k(queries, choices, limit, workers):
+    results = []
+    for start in range(0, len(queries), QUERY_CHUNK):
+        chunk = queries[start:start + QUERY_CHUNK]
+        matrix = rf_process.cdist(
+            chunk, choices,
+            scorer=rf_fuzz.WRatio, processor=rf_utils.default_process,
+            score_cutoff=SCORE_CUTOFF + 1, dtype=np.uint8, workers=workers,
+        )
+        k = min(limit, matrix.shape[1])
+        top = np.argpartition(-matrix.astype(np.int16), k - 1, axis=1)[:, :k] if k else np.empty((len(chunk), 0), int)
+        for row, cols in zip(matrix, top):
+            cols = cols[np.lexsort((cols, -row[cols].astype(np.int16)))]
+            results.append([(choices[c], int(row[c])) for c in cols if row[c] > SCORE_CUTOFF])
+    return results
+
+def bulk_suggestions(queries, choices, limit=3, workers=None, index=None):
+    """
+    Top-k suggestions (score > 70) for every query, as one list per query.
+    Duplicate queries are scored once. Uses rapidfuzz.cdist when installed,
+    otherwise the NumPy akshara kernel (spread over `workers` processes).
+    """
+    workers = workers or os.cpu_count() or 1
+    unique = list(dict.fromkeys(q for q in queries if q))
+    choices = list(choices)
+
+    if HAS_RAPIDFUZZ:
+        answers = _rapidfuzz_top_k(unique, choices, limit, workers)
+    elif workers > 1 and len(unique) > QUERY_CHUNK:
+        chunks = [(unique[i:i + QUERY_CHUNK], limit) for i in range(0, len(unique), QUERY_CHUNK)]
+        with ProcessPoolExecutor(workers, initializer=_init_kernel_worker, initargs=(choices,)) as pool:
+            answers = [row for part in pool.map(_kernel_chunk, chunks) for row in part]
+    else:
+        index = index or AksharaIndex(choices)
+        answers = [index.top_k(q, limit) for q in unique]
+
+    lookup = dict(zip(unique, answers))
+    return [lookup.get(q, []) for q in queries]
+
+def correct_file(input_path, output_path, limit=3):
+    """Writes 'token, suggestion, score' rows for every token (one per line) of input_path."""
+    from word_joiner import KannadaWordBuilder  # Local: word_joiner -> fuzzy_matcher -> bulk_fuzzy
+
+    with open(input_path, 'r', encoding='utf-8-sig') as f:
+        tokens = [line.strip() for line in f if line.strip()]
+    print(f"--- 🔧 Correcting {len(tokens)} tokens ---")
+
+    builder = KannadaWordBuilder()
+    suggestions = builder.fuzzy_engine.get_bulk_suggestions(tokens, limit=limit)
+
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(["token", "suggestion", "score", "alternatives"])
+        for token, matches in zip(tokens, suggestions):
+            if token in builder.root_words:
+                writer.writerow([token, token, 100, ""])
+            elif matches:
+                writer.writerow([token, matches[0][0], matches[0][1], " ".join(m[0] for m in matches[1:])])
+            else:
+                writer.writerow([token, "", 0, ""])
+    print(f"✅ Saved corrections to {output_path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python {os.path.basename(__file__)} <tokens.txt> <corrections.csv>")
+        sys.exit(1)
+    correct_file(sys.argv[1], sys.argv[2])
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from itertools import groupby
+from text_normalizer import normalize_word, word_problem
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# file -> (word columns to normalize/validate, columns that must not be case-ending fragments,
+#          duplicate key, which duplicate survives)
+# Survivors follow the loaders: root_words is read into a dict (last row wins, first position),
+# compound hints keep CSV order (first row wins).
+TABLES = {
+    'root_words.csv': (('word',), ('word',), ('word',), 'last'),
+    'compound_words.csv': (('word1', 'word2', 'combined'), ('word1', 'word2'), ('word1', 'word2'), 'first'),
+}
+PLACEHOLDER_COLUMNS = ('meaning', 'last_sound')  # 'TODO' left by the scrapers -> empty
+
+SAMPLES = 5  # Removed values kept per reason in the report
+
+# --- EXTERNAL MERGE SORT ---
+def _spill(rows, tmp_dir):
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n')
+    return path
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def external_sort(rows, key, chunk_rows=200000, tmp_dir=None):
+    """
+    Sorts an iterable of JSON-serializable rows with at most chunk_rows in memory:
+    sorted runs are spilled to temp files, then streamed through a k-way merge.
+    """
+    runs = []
+    chunk = []
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                chunk.sort(key=key)
+                runs.append(_spill(chunk, run_dir))
+                chunk = []
+        chunk.sort(key=key)
+        if not runs:
+            yield from chunk
+            return
+        runs.append(_spill(chunk, run_dir))
+        chunk = []
+        yield from heapq.merge(*(_read_run(path) for path in runs), key=key)
+
+# --- CLEANING ---
+def case_fragments(builder):
+    """
+    Case endings that are never words on their own (ದಿಂದ, ಯಲ್ಲಿ, ಕ್ಕೆ, ಗಳು ...): every surface
+    ending the stemmer compiles plus the markers, except vowel-initial markers (ಅಲ್ಲಿ, ಒಳಗೆ
+    are also words) and sociative postpositions written apart (ಜೊತೆ, ಸಮೇತ).
+    """
+    from akshara import is_vowel
+    from vibhakti_stemmer import VibhaktiStemmer
+    endings = {form['suffix'] for form in VibhaktiStemmer(builder).forms if ' ' not in form['suffix']}
+    endings |= set(builder.vibhakti_markers)
+    standalone = {marker for marker, row in builder.vibhakti_markers.items() if row.get('type') == 'sociative'}
+    return frozenset(e for e in endings - standalone if e and not is_vowel(e[0]))
+
+class TableReport:
+    def __init__(self, name):
+        self.name = name
+        self.rows_in = 0
+        self.rows_out = 0
+        self.normalized = 0
+        self.placeholders = 0
+        self.removed = Counter()
+        self.samples = {}
+
+    def remove(self, reason, value):
+        self.removed[reason] += 1
+        samples = self.samples.setdefault(reason, [])
+        if len(samples) < SAMPLES:
+            samples.append(value)
+
+    def to_dict(self):
+        return {
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'normalized': self.normalized,
+            'placeholders_cleared': self.placeholders,
+            'removed': dict(self.removed),
+            'samples': self.samples,
+        }
+
+def _clean_rows(reader, header, spec, fragments, report):
+    """Yields [key, position, fields] for rows that survive normalization and validation."""
+    word_columns, fragment_columns, key_columns, _ = spec
+    word_idx = [header.index(c) for c in word_columns if c in header]
+    fragment_idx = {header.index(c) for c in fragment_columns if c in header}
+    key_idx = [header.index(c) for c in key_columns]
+    placeholder_idx = [header.index(c) for c in PLACEHOLDER_COLUMNS if c in header]
+
+    for position, fields in enumerate(reader):
+        report.rows_in += 1
+        fields = list(fields) + [''] * (len(header) - len(fields))
+        changed = False
+        problem = None
+        for i in word_idx:
+            word = normalize_word(fields[i])
+            changed |= word != fields[i]
+            fields[i] = word
+            problem = word_problem(word) or ('fragment' if i in fragment_idx and word in fragments else None)
+            if problem:
+                report.remove(problem, word)
+                break
+        if problem:
+            continue
+        for i in placeholder_idx:
+            if word_problem(fields[i].strip()) == 'placeholder':
+                fields[i] = ''
+                report.placeholders += 1
+        report.normalized += changed
+        yield [[fields[i] for i in key_idx], position, fields]
+
+def clean_table(input_path, output_path, spec, fragments, chunk_rows=200000, tmp_dir=None):
+    """
+    Normalizes, validates and dedupes one CSV with bounded memory:
+    sort by (key, position) -> keep one row per key -> sort back by position.
+    """
+    report = TableReport(os.path.basename(input_path))
+    keep = spec[3]
+    with open(input_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return report
+        cleaned = _clean_rows(reader, header, spec, fragments, report)
+        by_key = external_sort(cleaned, key=lambda r: (r[0], r[1]), chunk_rows=chunk_rows, tmp_dir=tmp_dir)
+
+        def survivors():
+            for key, group in groupby(by_key, key=lambda r: r[0]):
+                group = list(group)
+                if len(group) > 1:
+                    for _ in group[1:]:
+                        report.remove('duplicate', '/'.join(key))
+                fields = group[-1][2] if keep == 'last' else group[0][2]
+                yield [group[0][1], fields]
+
+        ordered = external_sort(survivors(), key=lambda r: r[0], chunk_rows=chunk_rows, tmp_dir=tmp_dir)
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8-sig') as out:
+            writer = csv.writer(out)
+            writer.writerow(header)
+            for _, fields in ordered:
+                writer.writerow(fields)
+                report.rows_out += 1
+    os.replace(tmp_path, output_path)
+    return report
+
+def clean_dictionaries(dict_dir, out_dir, chunk_rows=200000):
+    """Cleans every table of TABLES from dict_dir into out_dir (may be the same folder)."""
+    from word_joiner import KannadaWordBuilder
+    fragments = case_fragments(KannadaWordBuilder(dict_dir))
+    os.makedirs(out_dir, exist_ok=True)
+    reports = {}
+    for filename, spec in TABLES.items():
+        path = os.path.join(dict_dir, filename)
+        if os.path.exists(path):
+            reports[filename] = clean_table(path, os.path.join(out_dir, filename), spec, fragments,
+                                            chunk_rows, tmp_dir=out_dir).to_dict()
+    # The other tables (and rule profiles) are copied so out_dir is a complete dictionaries folder
+    if os.path.abspath(dict_dir) != os.path.abspath(out_dir):
+        for filename in os.listdir(dict_dir):
+            source = os.path.join(dict_dir, filename)
+            target = os.path.join(out_dir, filename)
+            if os.path.isdir(source):
+                shutil.copytree(source, target, dirs_exist_ok=True)
+            elif filename not in TABLES and filename.endswith('.csv'):
+                shutil.copyfile(source, target)
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize, validate and dedupe the dictionary CSVs.")
+    parser.add_argument('--dict-dir', default=os.path.join(BASE_DIR, 'dictionaries'))
+    parser.add_argument('--out', default=os.path.join(BASE_DIR, 'build', 'clean_dictionaries'),
+                        help="Output folder (pass the dictionaries folder itself to clean in place)")
+    parser.add_argument('--chunk-rows', type=int, default=200000, help="Rows sorted in memory per run")
+    parser.add_argument('--report', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    print(f"--- 🧹 Cleaning {args.dict_dir} -> {args.out} ---")
+    reports = clean_dictionaries(args.dict_dir, args.out, args.chunk_rows)
+    for filename, report in reports.items():
+        removed = ', '.join(f"{reason} {n}" for reason, n in sorted(report['removed'].items())) or 'nothing'
+        print(f"   {filename}: {report['rows_in']} -> {report['rows_out']} rows "
+              f"(removed: {removed}; normalized {report['normalized']}, placeholders {report['placeholders_cleared']})")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+    print("✅ Done")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import argparse
+import csv
+import hashlib
+import heapq
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from akshara import DIGIT, HALANT, SWARA_TO_MATRA, char_class
+from striped_cache import StripedCache
+from vibhakti_stemmer import TOKEN_REGEX, VibhaktiStemmer
+from word_joiner import KannadaWordBuilder
+
+# Independent vowels a vowel-initial second word can start with (its vowel merges into the junction)
+VOWELS = tuple(SWARA_TO_MATRA)
+# Endings a first word can lose at the junction (Lopa strips its vowel sign or halant)
+VOWEL_SIGNS = tuple(m for m in SWARA_TO_MATRA.values() if m) + (HALANT,)
+MAX_JUNCTION = 3  # Characters the sandhi inserts between the two words (e.g. ಯ + matra)
+
+# --- SKETCHES ---
+class CountMinSketch:
+    def __init__(self, width=1 << 20, depth=4):
+        """
+        Approximate counts in fixed memory (depth x width uint32): estimates never undercount,
+        and overcount by at most e/width of the total with probability 1 - exp(-depth).
+        """
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+        self.total = 0
+
+    def _columns(self, key):
+        # Double hashing, as in BloomFilter: two 64-bit halves of one digest give every row
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        """Counts key and returns its new estimate."""
+        columns = self._columns(key)
+        self.table[self._rows, columns] += count
+        self.total += count
+        return int(self.table[self._rows, columns].min())
+
+    def estimate(self, key):
+        return int(self.table[self._rows, self._columns(key)].min())
+
+    def merge(self, other):
+        """Adds another sketch of the same shape (e.g. from another worker)."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-min sketches must have the same width and depth to merge")
+        self.table += other.table
+        self.total += other.total
+
+class HeavyHitters:
+    def __init__(self, capacity=50000):
+        """
+        Keys whose sketch estimate is among the `capacity` largest. Holds at most
+        2 x capacity keys: when full, it is cut back to the top half and keys below
+        the new floor are no longer admitted.
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.floor = 0
+
+    def offer(self, key, estimate):
+        if key in self.counts or estimate > self.floor:
+            self.counts[key] = estimate
+            if len(self.counts) > 2 * self.capacity:
+                self._prune()
+
+    def _prune(self):
+        top = heapq.nlargest(self.capacity, self.counts.items(), key=lambda kv: kv[1])
+        self.counts = dict(top)
+        self.floor = top[-1][1] if len(top) == self.capacity else 0
+
+    def keys(self):
+        return list(self.counts)
+
+# --- MINER ---
+class CompoundMiner:
+    def __init__(self, builder, width=1 << 20, depth=4, capacity=50000, cache_size=200000):
+        """
+        One pass over raw text: every token is read as a lexicon root, a compound of two
+        roots (verified by re-joining them with the builder's rules) or an inflected form
+        whose stem is such a compound. Compound pairs are counted in a count-min sketch,
+        and the heaviest ones are kept as candidates.
+        """
+        self.builder = builder
+        self.stemmer = VibhaktiStemmer(builder)
+        # Split candidates by text piece: head -> roots it is (or is minus a final vowel sign / halant),
+        # tail -> non-marker roots it is (or is minus an initial vowel); no root starts with a non-prefix
+        roots = tuple(word for word in builder.root_words if word)
+        self.prefixes = frozenset(word[:i] for word in roots for i in range(1, len(word) + 1))
+        self.heads = self._index(roots, lambda word: word[:-1] if word[-1] in VOWEL_SIGNS else None,
+                                 lambda word: VOWEL_SIGNS.index(word[-1]))
+        self.tails = self._index([word for word in roots if not self._is_marker(word)],
+                                 lambda word: word[1:] if word[0] in VOWELS else None,
+                                 lambda word: VOWELS.index(word[0]))
+        # _join only succeeds on an example pair or a rule for the junction sounds
+        rules = builder.sandhi_rules
+        self.examples = frozenset((rule['example_word1'], rule['example_word2']) for rule in rules)
+        self.junctions = frozenset((rule['sound1'], rule['sound2']) for rule in rules if rule['sound1'] and rule['sound2'])
+        self._ends = {}  # first word -> (word after samasa resolution, its last sound)
+        self.sketch = CountMinSketch(width, depth)
+        self.hitters = HeavyHitters(capacity)
+        self.cache = StripedCache(cache_size)  # token -> (word1, word2) or None
+        self.stats = Counter()
+        self.markers = Counter()
+
+    @staticmethod
+    def _is_word(word):
+        return bool(word) and not any(char_class(c) == DIGIT for c in word)
+
+    def _is_marker(self, word):
+        return word in self.builder.vibhakti_markers or word.startswith("ಗಳ")
+
+    @staticmethod
+    def _index(words, strip, order):
+        # piece -> [the word itself, then words that strip to it in VOWEL_SIGNS / VOWELS order]
+        index = {word: [word] for word in words}
+        stripped = {}
+        for word in words:
+            piece = strip(word)
+            if piece:
+                stripped.setdefault(piece, []).append(word)
+        for piece, found in stripped.items():
+            index.setdefault(piece, []).extend(sorted(found, key=order))
+        return {piece: tuple(found) for piece, found in index.items()}
+
+
+    def _end(self, word1):
+        root, _ = self.builder._resolve_samasa(word1)
+        base = root or word1
+        self._ends[word1] = end = (base, self.builder._get_last_swara(base))
+        return end
+
+    def split(self, word):
+        """(word1, word2) of two lexicon roots that join_words turns into word, or None."""
+        firsts, seconds = [], {}
+        for i in range(1, len(word)):
+            head = word[:i]
+            if head not in self.prefixes:
+                break  # No root starts with it, nor with anything longer
+            firsts.extend((i, candidate) for candidate in self.heads.get(head, ()))
+        if not firsts:
+            return None
+        for j in range(firsts[0][0], min(firsts[-1][0] + MAX_JUNCTION, len(word) - 1) + 1):
+            found = self.tails.get(word[j:])
+            if found:
+                seconds[j] = found
+
+        # Longest first word first; the second word starts at most MAX_JUNCTION characters later
+        builder = self.builder
+        for i, word1 in reversed(firsts):
+            # _join can only succeed (non-marker word2) on an example pair or a rule for the
+            # junction sounds, both taken after samasa resolution: skip every other pair
+            base1, sound1 = self._ends.get(word1) or self._end(word1)
+            for j in range(i, min(i + MAX_JUNCTION, len(word) - 1) + 1):
+                for word2 in seconds.get(j, ()):
+                    if ((sound1, builder._get_first_swara(word2)) not in self.junctions
+                            and (base1, word2) not in self.examples):
+                        continue
+                    output = self.builder._join(word1, word2)
+                    if output['status'] == 'success' and output['result'] == word:
+                        return word1, word2
+        return None
+
+    def _analyse(self, token):
+        if not self._is_word(token) or token in self.builder.root_words:
+            return None
+        pair = self.split(token)
+        if pair:
+            return pair
+        # Inflected compound: strip the case ending, then split the (unknown) stem
+        for analysis in self.stemmer.analyses(token):
+            if analysis['in_lexicon']:
+                return None
+            pair = self.split(analysis['root'])
+            if pair:
+                return pair[0], pair[1], analysis['marker']
+        return None
+
+    def feed(self, lines):
+        """Counts every compound token of an iterable of text lines."""
+        for line in lines:
+            for token in TOKEN_REGEX.findall(line):
+                self.stats['tokens'] += 1
+                found = self.cache.get_or_compute(token, self._analyse)
+                if found is None:
+                    continue
+                if len(found) == 3:
+                    self.stats['inflected'] += 1
+                    self.markers[found[2]] += 1
+                self.stats['compounds'] += 1
+                key = found[0] + '\x1f' + found[1]
+                self.hitters.offer(key, self.sketch.add(key))
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        self.stats.update(other.stats)
+        self.markers.update(other.markers)
+        for key in other.hitters.keys():
+            self.hitters.offer(key, self.sketch.estimate(key))
+
+    def ranked(self, min_count=1, top=None):
+        """[(word1, word2, combined, count), ...] by estimated count, highest first."""
+        rows = []
+        for key in self.hitters.keys():
+            count = self.sketch.estimate(key)
+            if count >= min_count:
+                word1, word2 = key.split('\x1f')
+                rows.append((word1, word2, self.builder._join(word1, word2)['result'], count))
+        rows.sort(key=lambda r: (-r[3], r[0], r[1]))
+        return rows[:top] if top else rows
+
+# --- CORPUS PASS ---
+def _read_range(path, start, end):
+    """Lines whose first byte lies in [start, end) (a line cut by start belongs to the previous range)."""
+    with open(path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8', errors='replace')
+
+def _builder_args(builder):
+    """What a worker needs to rebuild the same builder: its sources and its rule profile."""
+    sources = {
+        'dict_dir': builder.dict_dir,
+        'db_path': builder.db.path if builder.db is not None else None,
+        'shared_path': builder.shared.path if builder.shared is not None else None,
+    }
+    return sources, builder.profile_name
+
+def _mine_range(path, start, end, width, depth, capacity, builder_args):
+    # Same dictionaries and profile as the parent, whose builder joins the ranked() results
+    sources, profile = builder_args
+    builder = KannadaWordBuilder(**sources).profile(profile)
+    miner = CompoundMiner(builder, width, depth, capacity)
+    miner.feed(_read_range(path, start, end))
+    miner.cache = None  # Not needed by the parent; keeps the pickle small
+    miner.stemmer = None
+    miner.builder = None
+    miner.prefixes = miner.heads = miner.tails = miner._ends = None
+    return miner
+
+def mine_corpus(path, workers=1, width=1 << 20, depth=4, capacity=50000, builder=None):
+    """
+    Mines a text file in one pass. With workers > 1 the file is cut into byte ranges
+    mined in parallel; their sketches and candidates are merged afterwards.
+    """
+    builder = builder or KannadaWordBuilder()
+    size = os.path.getsize(path)
+    if workers <= 1 or size < (1 << 20):
+        miner = CompoundMiner(builder, width, depth, capacity)
+        miner.feed(_read_range(path, 0, size))
+        return miner
+
+    step = -(-size // workers)
+    ranges = [(start, min(start + step, size)) for start in range(0, size, step)]
+    miner = CompoundMiner(builder, width, depth, capacity)
+    with ProcessPoolExecutor(workers) as pool:
+        args = _builder_args(builder)
+        futures = [pool.submit(_mine_range, path, start, end, width, depth, capacity, args) for start, end in ranges]
+        for future in futures:
+            miner.merge(future.result())
+    return miner
+
+def write_compounds(rows, output_path):
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(["word1", "word2", "combined", "frequency"])
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine frequency-ranked compounds from raw Kannada text.")
+    parser.add_argument('corpus', help="UTF-8 text file")
+    parser.add_argument('output', help="Compound CSV to write (compound_words.csv format)")
+    parser.add_argument('--workers', '-j', type=int, default=1, help="Parallel byte ranges")
+    parser.add_argument('--min-count', type=int, default=2, help="Drop compounds seen fewer times")
+    parser.add_argument('--top', type=int, default=None, help="Keep only the N most frequent")
+    parser.add_argument('--capacity', type=int, default=50000, help="Heavy-hitter candidates kept")
+    parser.add_argument('--width', type=int, default=1 << 20, help="Count-min sketch width")
+    parser.add_argument('--depth', type=int, default=4, help="Count-min sketch depth")
+    args = parser.parse_args()
+
+    print(f"--- ⛏️ Mining compounds from {args.corpus} ---")
+    started = time.perf_counter()
+    miner = mine_corpus(args.corpus, args.workers, args.width, args.depth, args.capacity)
+    rows = miner.ranked(args.min_count, args.top)
+    write_compounds(rows, args.output)
+
+    stats = miner.stats
+    print(f"   Tokens: {stats['tokens']}, compound tokens: {stats['compounds']} ({stats['inflected']} inflected)")
+    if miner.markers:
+        print(f"   Case endings on compounds: {', '.join(f'{m} {n}' for m, n in miner.markers.most_common(5))}")
+    print(f"✅ Wrote {len(rows)} compounds to {args.output} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from text_normalizer import normalize_word
+from word_validator import BloomFilter
+
+# --- FILE LAYOUT ---
+# header | blob | record offsets (uint64[n+1]) | by_word2 (uint32[n]) | by_combined (uint32[n]) | bloom bits
+# Records are 'word1 \x1f word2 \x1f combined \x1f frequency' (UTF-8), stored sorted by word1.
+# The three words are stored normalized (normalize_word), the form hint queries arrive in.
+# by_word2 / by_combined are record ids in word2 / combined order. All keys compare as UTF-8 bytes.
+MAGIC = b'KNCMP003'
+HEADER = struct.Struct('<8sQQQQQQQQQQ')
+SEP = b'\x1f'
+
+def _align(n):
+    return (n + 7) & ~7
+
+def build_store(csv_path, store_path):
+    """
+    Converts compound_words.csv into the sorted, memory-mappable store file.
+    Rows keep their CSV order within the same word1, so the first hint stays the same.
+    """
+    records = []
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            fields = [normalize_word(row.get('word1') or ''), normalize_word(row.get('word2') or ''),
+                      normalize_word(row.get('combined') or ''), row.get('frequency') or '']
+            records.append([field.replace('\x1f', '').encode('utf-8') for field in fields])
+
+    records.sort(key=lambda r: r[0])  # Stable: CSV order kept inside a word1 range
+    count = len(records)
+    by_word2 = sorted(range(count), key=lambda i: records[i][1])
+    by_combined = sorted(range(count), key=lambda i: records[i][2])
+
+    bloom = BloomFilter(count)
+    for record in records:
+        bloom.add(record[2].decode('utf-8'))
+
+    blob = bytearray()
+    offsets = [0]
+    for record in records:
+        blob += SEP.join(record)
+        offsets.append(len(blob))
+
+    stat = os.stat(csv_path)
+    blob_off = _align(HEADER.size)
+    rec_off = _align(blob_off + len(blob))
+    word2_off = rec_off + 8 * (count + 1)
+    combined_off = _align(word2_off + 4 * count)
+    bloom_off = _align(combined_off + 4 * count)
+
+    # Per-process temp name: processes rebuilding the same stale store never share a half-written file
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, count, blob_off, rec_off,
+                            word2_off, combined_off, bloom_off, bloom.size, bloom.hash_count))
+        for offset, data in (
+            (blob_off, blob),
+            (rec_off, struct.pack(f'<{count + 1}Q', *offsets)),
+            (word2_off, struct.pack(f'<{count}I', *by_word2)),
+            (combined_off, struct.pack(f'<{count}I', *by_combined)),
+            (bloom_off, bloom.bits),
+        ):
+            f.seek(offset)
+            f.write(data)
+    os.replace(tmp_path, store_path)
+
+class CompoundStore:
+    def __init__(self, store_path):
+        """
+        Read-only view of a store file. Nothing is loaded up front: lookups binary-search
+        the memory-mapped indexes and decode only the matching records.
+        """
+        self.path = store_path
+        self._file = open(store_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mm)
+
+        (magic, self.source_size, self.source_mtime_ns, self.count, blob_off, rec_off,
+         word2_off, combined_off, bloom_off, bloom_size, bloom_hashes) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a compound store: {store_path}")
+
+        n = self.count
+        self._blob_off = blob_off
+        self._offsets = view[rec_off:rec_off + 8 * (n + 1)].cast('Q')
+        self._by_word2 = view[word2_off:word2_off + 4 * n].cast('I')
+        self._by_combined = view[combined_off:combined_off + 4 * n].cast('I')
+        self.bloom = BloomFilter.from_bits(view[bloom_off:bloom_off + (bloom_size + 7) // 8], bloom_size, bloom_hashes)
+
+    @classmethod
+    def open_for(cls, csv_path, store_path=None):
+        """
+        Opens the store next to a CSV, (re)building it when missing or older than the CSV.
+        """
+        store_path = store_path or os.path.splitext(csv_path)[0] + '.idx'
+        stat = os.stat(csv_path)
+        store = cls._open_current(store_path, stat)
+        if store is not None:
+            return store
+        try:
+            build_store(csv_path, store_path)
+        except OSError:
+            # Read-only dictionaries folder: keep the index in the temp folder instead.
+            # The name must be the same in every process (hash() of a str is salted per process).
+            digest = hashlib.sha1(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+            store_path = os.path.join(tempfile.gettempdir(), f"compound_store_{digest}.idx")
+            store = cls._open_current(store_path, stat)
+            if store is not None:
+                return store
+            build_store(csv_path, store_path)
+        return cls(store_path)
+
+    @classmethod
+    def _open_current(cls, store_path, stat):
+        """The store at store_path if it was built from this version of the CSV, else None."""
+        if not os.path.exists(store_path):
+            return None
+        try:
+            store = cls(store_path)
+        except (OSError, ValueError, struct.error):
+            return None
+        if (store.source_size, store.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return store
+        store.close()
+        return None
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        for view in (self.bloom.bits, self._offsets, self._by_word2, self._by_combined, self._view):
+            view.release()
+        self.bloom = None
+        self._mm.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    # --- RECORD ACCESS ---
+    def _record(self, i):
+        start = self._blob_off + self._offsets[i]
+        end = self._blob_off + self._offsets[i + 1]
+        return self._mm[start:end].split(SEP)
+
+    def _field(self, i, field):
+        return self._record(i)[field]
+
+    def _lower_bound(self, key, field, order=None):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rec = order[mid] if order is not None else mid
+            if self._field(rec, field) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _range(self, word, field, order=None):
+        key = word.encode('utf-8')
+        i = self._lower_bound(key, field, order)
+        while i < self.count:
+            rec = order[i] if order is not None else i
+            record = self._record(rec)
+            if record[field] != key:
+                break
+            yield record
+            i += 1
+
+    # --- QUERIES ---
+    def get_hints(self, first_word):
+        """All compounds starting with first_word: [{'next_word', 'result'}, ...]"""
+        return [
+            {'next_word': r[1].decode('utf-8'), 'result': r[2].decode('utf-8')}
+            for r in self._range(first_word, 0)
+        ]
+
+    def get_hints_for_second(self, second_word):
+        """All compounds ending with second_word: [{'prev_word', 'result'}, ...]"""
+        return [
+            {'prev_word': r[0].decode('utf-8'), 'result': r[2].decode('utf-8')}
+            for r in self._range(second_word, 1, self._by_word2)
+        ]
+
+    def has_combined(self, combined):
+        """Exact check (binary search) for a known compound word."""
+        for _ in self._range(combined, 2, self._by_combined):
+            return True
+        return False
+
+    def __contains__(self, combined):
+        """True if combined is a known compound word (Bloom filter, then binary search)."""
+        return combined in self.bloom and self.has_combined(combined)
+
+    def __iter__(self):
+        """Yields (word1, word2, combined, frequency) in word1 order."""
+        for i in range(self.count):
+            yield tuple(field.decode('utf-8') for field in self._record(i))
@@ -0,0 +1,322 @@
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from striped_cache import StripedCache
+from text_normalizer import normalize_word
+
+# table -> (csv file, columns, upsert key)
+# Every row also keeps its raw CSV fields (so odd/legacy rows export unchanged) and its position.
+TABLES = {
+    'roots': ('root_words.csv', ('word', 'meaning', 'word_type', 'last_sound', 'can_combine'), ('word',)),
+    'sandhi': ('sandhi_rules.csv', ('rule_number', 'sandhi_type', 'sound1', 'sound2', 'result',
+                                    'example_word1', 'example_word2', 'combined_result'), ('example_word1', 'example_word2')),
+    'markers': ('vibhakti_rules.csv', ('marker', 'meaning', 'type', 'logic_type'), ('marker',)),
+    'samasa': ('samasa_rules.csv', ('rule_name', 'suffix_to_drop', 'replacement_sound', 'example_input', 'example_root'),
+               ('suffix_to_drop', 'replacement_sound')),
+    'compounds': ('compound_words.csv', ('word1', 'word2', 'combined', 'frequency'), ('word1', 'word2')),
+}
+
+# Lookup columns hold normalize_word() keys (the raw spelling stays in 'fields')
+KEY_COLUMNS = {
+    'roots': ('word',),
+    'compounds': ('word1', 'word2', 'combined'),
+}
+KEY_FORMAT = 'normalize_word/2'  # 2: nukta kept
+
+# Key lookups of the builder views and upsert(); the rule tables are read whole (rows())
+INDEXES = {
+    'roots': [('word', 'pos')],
+    'sandhi': [('example_word1', 'example_word2', 'pos')],
+    'markers': [('marker', 'pos')],
+    'samasa': [('suffix_to_drop', 'replacement_sound', 'pos')],
+    'compounds': [('word1', 'pos'), ('word2', 'word1', 'pos'), ('combined',)],
+}
+
+# Indexes of older databases that nothing queries any more
+DROPPED_INDEXES = ('sandhi_sound1_sound2_pos', 'samasa_suffix_to_drop_pos')
+
+def row_dict(header, fields):
+    """Same mapping csv.DictReader gives for these fields (extras under None, missing -> None)."""
+    row = dict(zip(header, fields))
+    if len(fields) > len(header):
+        row[None] = fields[len(header):]
+    for key in header[len(fields):]:
+        row[key] = None
+    return row
+
+class DictionaryDB:
+    def __init__(self, path):
+        """
+        SQLite copy of the dictionary CSVs with indexed lookups.
+        One connection per thread; reads never block each other (WAL).
+        """
+        self.path = path
+        self._local = threading.local()
+        self._headers = {}
+        conn = self._conn()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, header TEXT NOT NULL)")
+            for table, (_, columns, _) in TABLES.items():
+                cols = ", ".join(f"{c} TEXT" for c in columns)
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (pos INTEGER PRIMARY KEY, {cols}, fields TEXT NOT NULL)")
+                for index in INDEXES[table]:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_{'_'.join(index)} ON {table} ({', '.join(index)})")
+            for index in DROPPED_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            # Revision stamp: a per-file id plus a counter bumped by every write (see revision())
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('db_id', ?)", (os.urandom(8).hex(),))
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('revision', '0')")
+            if self._meta(conn, 'key_format') != KEY_FORMAT:
+                self._rekey(conn)
+        self.compounds = CompoundTable(self)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _meta(conn, name):
+        row = conn.execute("SELECT header FROM meta WHERE name=?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _rekey(self, conn):
+        # Databases imported before keys were normalized: recompute the lookup columns in place
+        for table, columns in KEY_COLUMNS.items():
+            positions = {column: TABLES[table][1].index(column) for column in columns}
+            rows = conn.execute(f"SELECT pos, fields FROM {table}").fetchall()
+            for pos, fields in rows:
+                values = self._values(table, json.loads(fields))
+                conn.execute(f"UPDATE {table} SET {', '.join(f'{c}=?' for c in columns)} WHERE pos=?",
+                             (*(values[positions[c]] for c in columns), pos))
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('key_format', ?)", (KEY_FORMAT,))
+        self._bump(conn)
+
+    @staticmethod
+    def _bump(conn):
+        conn.execute("UPDATE meta SET header = CAST(header AS INTEGER) + 1 WHERE name='revision'")
+
+    def revision(self):
+        """
+        Changes whenever the content changes (import_csv, upsert), and differs between
+        database files, so it can stand in for the CSVs' content hash (join_cache).
+        """
+        conn = self._conn()
+        return f"{self._meta(conn, 'db_id')}/{self._meta(conn, 'revision')}"
+
+    def query(self, sql, params=()):
+        return self._conn().execute(sql, params)
+
+    def header(self, table):
+        if table not in self._headers:
+            row = self.query("SELECT header FROM meta WHERE name=?", (table,)).fetchone()
+            self._headers[table] = tuple(json.loads(row[0])) if row else TABLES[table][1]
+        return self._headers[table]
+
+    def _row(self, table, fields):
+        return MappingProxyType({
+            k: tuple(v) if isinstance(v, list) else v
+            for k, v in row_dict(self.header(table), json.loads(fields)).items()
+        })
+
+    def _values(self, table, fields):
+        """Indexed column values for raw fields, read the way the builder reads them."""
+        row = row_dict(self.header(table), fields)
+        keys = KEY_COLUMNS.get(table, ())
+        return [normalize_word(row[column]) if column in keys and row.get(column) else row.get(column)
+                for column in TABLES[table][1]]
+
+    # --- CSV IMPORT / EXPORT ---
+    def import_csv(self, dict_dir):
+        """Replaces every table with the matching CSV of dict_dir (one transaction)."""
+        conn = self._conn()
+        counts = {}
+        with conn:
+            for table, (filename, columns, _) in TABLES.items():
+                path = os.path.join(dict_dir, filename)
+                if not os.path.exists(path):
+                    continue
+                with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                    rows = list(csv.reader(f))
+                header = rows[0] if rows else list(columns)
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (table, json.dumps(header, ensure_ascii=False)))
+                self._headers.pop(table, None)
+                conn.execute(f"DELETE FROM {table}")
+                conn.executemany(
+                    f"INSERT INTO {table} VALUES (?, {', '.join('?' * len(columns))}, ?)",
+                    ((pos, *self._values(table, fields), json.dumps(fields, ensure_ascii=False))
+                     for pos, fields in enumerate(rows[1:])),
+                )
+                counts[table] = len(rows) - 1
+            self._bump(conn)
+        return counts
+
+    def export_csv(self, out_dir):
+        """Writes the tables back as CSVs (same header, rows and order as imported / upserted)."""
+        os.makedirs(out_dir, exist_ok=True)
+        for table, (filename, _, _) in TABLES.items():
+            if self.query("SELECT 1 FROM meta WHERE name=?", (table,)).fetchone() is None:
+                continue
+            with open(os.path.join(out_dir, filename), 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.header(table))
+                for (fields,) in self.query(f"SELECT fields FROM {table} ORDER BY pos"):
+                    writer.writerow(json.loads(fields))
+
+    # --- BULK UPSERT ---
+    def upsert(self, table, rows, update=True):
+        """
+        Inserts rows (dicts by column name, or field lists in CSV order) in one transaction.
+        A row whose key (TABLES) already exists replaces the effective (last) row with that key,
+        or is skipped with update=False (e.g. scraped 'TODO' words must not clobber real ones).
+        Returns: (inserted, updated)
+        """
+        _, columns, key = TABLES[table]
+        header = self.header(table)
+        conn = self._conn()
+        inserted = updated = 0
+        with conn:
+            if conn.execute("SELECT 1 FROM meta WHERE name=?", (table,)).fetchone() is None:
+                conn.execute("INSERT INTO meta VALUES (?, ?)", (table, json.dumps(list(header), ensure_ascii=False)))
+            (next_pos,) = conn.execute(f"SELECT COALESCE(MAX(pos) + 1, 0) FROM {table}").fetchone()
+            where = " AND ".join(f"{k}=?" for k in key)
+            for row in rows:
+                fields = [row.get(h) or '' for h in header] if isinstance(row, Mapping) else list(row)
+                values = self._values(table, fields)
+                found = conn.execute(
+                    f"SELECT pos FROM {table} WHERE {where} ORDER BY pos DESC LIMIT 1",
+                    [values[columns.index(k)] for k in key],
+                ).fetchone()
+                raw = json.dumps(fields, ensure_ascii=False)
+                if found is None:
+                    conn.execute(f"INSERT INTO {table} VALUES (?, {', '.join('?' * len(columns))}, ?)",
+                                 (next_pos, *values, raw))
+                    next_pos += 1
+                    inserted += 1
+                elif update:
+                    assignments = ", ".join(f"{c}=?" for c in columns)
+                    conn.execute(f"UPDATE {table} SET {assignments}, fields=? WHERE pos=?", (*values, raw, found[0]))
+                    updated += 1
+            if inserted or updated:
+                self._bump(conn)
+        return inserted, updated
+
+    # --- BUILDER VIEWS ---
+    def rows(self, table):
+        """All rows in file order (rule tables are small)."""
+        return [self._row(table, fields) for (fields,) in self.query(f"SELECT fields FROM {table} ORDER BY pos")]
+
+    def keyed_rows(self, table, column):
+        """(key, row) pairs the way a dict built from the CSV ends up: first position, last value."""
+        sql = (f"SELECT t.{column}, t.fields FROM {table} t JOIN "
+               f"(SELECT {column} AS k, MIN(pos) AS first, MAX(pos) AS last FROM {table} GROUP BY {column}) g "
+               f"ON t.pos = g.last ORDER BY g.first")
+        for key, fields in self.query(sql):
+            yield key, self._row(table, fields)
+
+    def root_words(self, cache_size=65536):
+        return LazyTable(self, 'roots', 'word', cache_size)
+
+    def markers(self):
+        return MappingProxyType(dict(self.keyed_rows('markers', 'marker')))
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_MISSING = object()
+
+class LazyTable(Mapping):
+    def __init__(self, db, table, column, cache_size=65536):
+        """
+        Read-only mapping over a keyed table; rows are fetched on first access
+        (and cached), nothing is loaded up front.
+        """
+        self.db = db
+        self.table = table
+        self.column = column
+        self._cache = StripedCache(cache_size)
+        self._sql = f"SELECT fields FROM {table} WHERE {column}=? ORDER BY pos DESC LIMIT 1"
+
+    def _fetch(self, key):
+        row = self.db.query(self._sql, (key,)).fetchone()
+        return self.db._row(self.table, row[0]) if row else None
+
+    def __getitem__(self, key):
+        row = self._cache.get_or_compute(key, self._fetch)
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def __contains__(self, key):
+        return self._cache.get_or_compute(key, self._fetch) is not None
+
+    def __len__(self):
+        return self.db.query(f"SELECT COUNT(DISTINCT {self.column}) FROM {self.table}").fetchone()[0]
+
+    def __iter__(self):
+        for key, _ in self.db.keyed_rows(self.table, self.column):
+            yield key
+
+    def items(self):
+        # One streaming query instead of one lookup per key
+        return list(self.db.keyed_rows(self.table, self.column))
+
+class CompoundTable:
+    def __init__(self, db):
+        """Compound queries over the compounds table, same results as CompoundStore."""
+        self.db = db
+        self.bloom = None  # The index answers misses directly
+
+    def get_hints(self, first_word):
+        return [
+            {'next_word': word2, 'result': combined}
+            for word2, combined in self.db.query(
+                "SELECT word2, combined FROM compounds WHERE word1=? ORDER BY pos", (first_word,))
+        ]
+
+    def get_hints_for_second(self, second_word):
+        return [
+            {'prev_word': word1, 'result': combined}
+            for word1, combined in self.db.query(
+                "SELECT word1, combined FROM compounds WHERE word2=? ORDER BY word1, pos", (second_word,))
+        ]
+
+    def has_combined(self, combined):
+        return self.db.query("SELECT 1 FROM compounds WHERE combined=? LIMIT 1", (combined,)).fetchone() is not None
+
+    __contains__ = has_combined
+
+    def __len__(self):
+        return self.db.query("SELECT COUNT(*) FROM compounds").fetchone()[0]
+
+    def __iter__(self):
+        for word1, word2, combined, frequency in self.db.query(
+                "SELECT word1, word2, combined, frequency FROM compounds ORDER BY word1, pos"):
+            yield word1, word2, combined, frequency
+
+def main():
+    usage = (f"Usage: python {os.path.basename(__file__)} import <dictionaries_dir> <dictionary.db>\n"
+             f"       python {os.path.basename(__file__)} export <dictionary.db> <out_dir>")
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export'):
+        print(usage)
+        sys.exit(1)
+    if sys.argv[1] == 'import':
+        counts = DictionaryDB(sys.argv[3]).import_csv(sys.argv[2])
+        print(f"✅ Imported {', '.join(f'{n} {t}' for t, n in counts.items())} into {sys.argv[3]}")
+    else:
+        DictionaryDB(sys.argv[2]).export_csv(sys.argv[3])
+        print(f"✅ Exported {sys.argv[2]} to {sys.argv[3]}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-import csv
 import os
+from populate_baseline import append_new_rows
 
 def fix_missing_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,10 +22,8 @@ def fix_missing_data():
     ]
 
     word_path = os.path.join(dict_dir, 'root_words.csv')
-    with open(word_path, 'a', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerows(missing_words)
-    print(f"✅ Added {len(missing_words)} missing words to dictionary.")
+    added = append_new_rows(word_path, missing_words)
+    print(f"✅ Added {added} missing words to dictionary.")
 
     # 2. Add Missing/Strict Rules to sandhi_rules.csv
     # Your previous rules might have been too specific (e.g., only 'aa'+'aa'). 
@@ -39,10 +37,8 @@ def fix_missing_data():
     ]
 
     rule_path = os.path.join(dict_dir, 'sandhi_rules.csv')
-    with open(rule_path, 'a', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerows(missing_rules)
-    print(f"✅ Added {len(missing_rules)} additional Sandhi rules.")
+    added = append_new_rows(rule_path, missing_rules)
+    print(f"✅ Added {added} additional Sandhi rules.")
 
 if __name__ == "__main__":
     fix_missing_data()
\ No newline at end of file
@@ -1,4 +1,9 @@
+import warnings
+# fuzzywuzzy warns on import when python-Levenshtein is missing; bulk mode uses rapidfuzz when it can
+warnings.filterwarnings('ignore', message='Using slow pure-python SequenceMatcher', category=UserWarning)
 from fuzzywuzzy import process # [cite: 86]
+from bulk_fuzzy import HAS_RAPIDFUZZ, AksharaIndex, bulk_suggestions
+from text_normalizer import normalize_input
 
 class FuzzyMatcher:
     def __init__(self, word_list):
@@ -6,12 +11,14 @@ class FuzzyMatcher:
         Initialize with a list of valid dictionary words.
         """
         self.word_list = word_list
+        self._index = None # Akshara index for bulk mode, built on first use
 
     def get_suggestions(self, user_input, limit=3): # [cite: 92]
         """
         Returns top 3 closest matches for a typo.
         Returns: List of tuples [('word', score), ...]
         """
+        user_input = normalize_input(user_input)
         if not user_input:
             return []
             
@@ -20,4 +27,15 @@ class FuzzyMatcher:
         
         # Filter for decent matches (>70% similarity) to avoid garbage suggestions
         valid_matches = [m for m in matches if m[1] > 70]
-        return valid_matches
\ No newline at end of file
+        return valid_matches
+
+    def get_bulk_suggestions(self, queries, limit=3, workers=None):
+        """
+        Batch version of get_suggestions for whole input files.
+        Scores all queries against the lexicon as a matrix instead of one scan per word.
+        Returns: one list of tuples [('word', score), ...] per query
+        """
+        if self._index is None and not HAS_RAPIDFUZZ:
+            self._index = AksharaIndex(self.word_list)
+        queries = [normalize_input(q) for q in queries]
+        return bulk_suggestions(queries, self.word_list, limit=limit, workers=workers, index=self._index)
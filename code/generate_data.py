@@ -3,18 +3,25 @@ import os
 import random
 from word_joiner import KannadaWordBuilder # Uses your logic
 
-def generate_massive_data():
+def generate_massive_data(base_dir=None, seed=None, write_tests=True):
+    # seed makes the output reproducible (used by build_pipeline.py); None keeps it random
     print("--- 🏭 Generating Compounds & Test Cases ---")
+    rng = random.Random(seed)
+    base_dir = base_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     # 1. Initialize
-    builder = KannadaWordBuilder()
+    builder = KannadaWordBuilder(os.path.join(base_dir, 'dictionaries'))
     root_words = list(builder.root_words.keys())
     
+    # Only words whose ending sound has a Sandhi rule can produce an "interesting" join
+    # (vectorized filter over the lexicon instead of a Python loop)
+    rule_sounds = {rule['sound1'] for rule in builder.sandhi_rules}
+    first_words = builder.features.select(last_swara=rule_sounds) or root_words
+    
     if len(root_words) < 100:
         print("❌ Error: Not enough root words. Run 'bulk_scrape_wiki.py' first!")
         return
 
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     comp_path = os.path.join(base_dir, 'dictionaries', 'compound_words.csv')
     test_path = os.path.join(base_dir, 'test cases', 'word_pairs_test.csv')
 
@@ -32,8 +39,8 @@ def generate_massive_data():
         attempts += 1
         
         # Pick 2 random words
-        w1 = random.choice(root_words)
-        w2 = random.choice(root_words)
+        w1 = rng.choice(first_words)
+        w2 = rng.choice(root_words)
         
         # Try to join them
         output = builder.join_words(w1, w2)
@@ -71,6 +78,8 @@ def generate_massive_data():
     print(f"✅ Saved {len(generated_compounds)} pairs to compound_words.csv")
 
     # B. Test Cases
+    if not write_tests:
+        return
     with open(test_path, 'w', newline='', encoding='utf-8-sig') as f:
         writer = csv.writer(f)
         writer.writerow(["test_id", "word1", "word2", "expected_result", "sandhi_rule_used", "is_valid_compound"])
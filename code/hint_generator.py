@@ -1,35 +1,38 @@
-import csv
 import os
+from compound_store import CompoundStore
+from text_normalizer import normalize_input
 
 class HintGenerator:
-    def __init__(self):
-        self.compound_db = {} # Stores {word1: [list of possible word2]}
-        self._load_compounds()
+    def __init__(self, dict_dir=None, store=None):
+        # Sorted, memory-mapped compound index (compound_words.idx), or any store with the same queries
+        self.store = store
+        if store is None:
+            self._load_compounds(dict_dir)
 
-    def _load_compounds(self):
+    def _load_compounds(self, dict_dir=None):
         # Construct path to dictionaries/compound_words.csv
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        path = os.path.join(base_dir, 'dictionaries', 'compound_words.csv')
+        if dict_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            dict_dir = os.path.join(base_dir, 'dictionaries')
+        path = os.path.join(dict_dir, 'compound_words.csv')
         
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    w1 = row['word1']
-                    w2 = row['word2']
-                    combined = row['combined']
-                    
-                    if w1 not in self.compound_db:
-                        self.compound_db[w1] = []
-                    
-                    # Store valid pairs [cite: 106]
-                    self.compound_db[w1].append({
-                        'next_word': w2,
-                        'result': combined
-                    })
+            # Builds the .idx file on first use / when the CSV changes; otherwise just maps it.
+            # Nothing is read into memory, so startup does not grow with the number of compounds.
+            self.store = CompoundStore.open_for(path)
 
     def get_hints(self, first_word):
         """
         Returns specific compound suggestions for a given first word.
         """
-        return self.compound_db.get(first_word, [])
\ No newline at end of file
+        if self.store is None:
+            return []
+        return self.store.get_hints(normalize_input(first_word))
+
+    def get_reverse_hints(self, second_word):
+        """
+        Returns compounds that end with the given second word.
+        """
+        if self.store is None:
+            return []
+        return self.store.get_hints_for_second(normalize_input(second_word))
\ No newline at end of file
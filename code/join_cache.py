@@ -0,0 +1,197 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from text_normalizer import normalize_input
+from word_joiner import dictionary_files
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose code changes what join_words returns (result, rule or validation)
+RULE_MODULES = ('word_joiner.py', 'akshara.py', 'word_validator.py', 'text_normalizer.py')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS joins (
+    fingerprint TEXT NOT NULL,
+    profile     TEXT NOT NULL,
+    word1       TEXT NOT NULL,
+    word2       TEXT NOT NULL,
+    output      TEXT NOT NULL,
+    stamp       INTEGER NOT NULL,
+    PRIMARY KEY (fingerprint, profile, word1, word2)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS joins_stamp ON joins (stamp);
+"""
+
+def dictionary_fingerprint(dict_dir, code_dir=CODE_DIR, db=None):
+    """
+    Content hash of every dictionary CSV (profiles included) and of the rule modules.
+    With a DictionaryDB (builder.db), its revision stamp stands in for the tables it serves.
+    """
+    digest = hashlib.sha256()
+    if db is not None:
+        digest.update(b'db\0' + db.revision().encode('utf-8'))
+    paths = [(name, os.path.join(dict_dir, name)) for name in dictionary_files(dict_dir)]
+    paths += [(name, os.path.join(code_dir, name)) for name in RULE_MODULES]
+    for name, path in paths:
+        if os.path.exists(path):
+            digest.update(name.encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:32]
+
+class JoinCache:
+    def __init__(self, path, fingerprint, max_entries=2000000, batch_size=1000, flush_interval=2.0):
+        """
+        Persistent join results shared by processes, keyed by (fingerprint, profile, word1, word2).
+        SQLite in WAL mode: any number of readers, one writer at a time. Writes are buffered
+        and committed in batches; past max_entries, rows of other fingerprints (old dictionary
+        versions) go first, then the oldest rows. The row count is kept as a running upper
+        bound (this process's inserts) and only recounted once it passes max_entries, so a
+        flush does not scan the table; rows other processes add are seen at that recount.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._pending = {}
+        self._pending_since = None
+        self._lock = threading.Lock()
+        self._connections = []
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self._rows = self._count(conn)
+        atexit.register(self.flush)
+
+    def _conn(self):
+        # One connection per thread (sqlite3 connections are not shared across threads)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    # --- READS ---
+    def get(self, word1, word2, profile=''):
+        key = (profile, word1, word2)
+        with self._lock:
+            output = self._pending.get(key)
+        if output is None:
+            row = self._conn().execute(
+                "SELECT output FROM joins WHERE fingerprint=? AND profile=? AND word1=? AND word2=?",
+                (self.fingerprint, profile, word1, word2),
+            ).fetchone()
+            output = row[0] if row else None
+        with self._lock:
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(output) if output is not None else None
+
+    # --- WRITES ---
+    def put(self, word1, word2, output, profile=''):
+        with self._lock:
+            self._pending[(profile, word1, word2)] = json.dumps(output, ensure_ascii=False)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._pending_since >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Commits buffered results in one transaction, then evicts if over max_entries."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_since = None
+        if not pending:
+            return
+        stamp = time.time_ns()
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO joins VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.fingerprint, p, w1, w2, out, stamp) for (p, w1, w2), out in pending.items()],
+            )
+        with self._lock:
+            self._rows += len(pending)  # Upper bound: some rows replaced existing ones
+            due = self._rows > self.max_entries
+        if due:
+            self._evict(conn)
+
+    @staticmethod
+    def _count(conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM joins").fetchone()
+        return count
+
+    def _evict(self, conn):
+        count = self._count(conn)
+        excess = count - self.max_entries
+        if excess <= 0:
+            with self._lock:
+                self._rows = count
+            return
+        with conn:
+            # Results of other dictionary versions can never be hit again
+            excess -= conn.execute("DELETE FROM joins WHERE fingerprint != ?", (self.fingerprint,)).rowcount
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM joins WHERE (fingerprint, profile, word1, word2) IN "
+                    "(SELECT fingerprint, profile, word1, word2 FROM joins ORDER BY stamp LIMIT ?)",
+                    (excess,),
+                )
+        with self._lock:
+            self._rows = min(count, self.max_entries)
+
+    def __len__(self):
+        self.flush()
+        (count,) = self._conn().execute(
+            "SELECT COUNT(*) FROM joins WHERE fingerprint=?", (self.fingerprint,)).fetchone()
+        return count
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+class CachedJoiner:
+    def __init__(self, builder, cache):
+        """join_words() with a persistent JoinCache in front; same outputs as the builder."""
+        self.builder = builder
+        self.cache = cache
+
+    @classmethod
+    def open(cls, builder, cache_path, **kwargs):
+        fingerprint = dictionary_fingerprint(builder.dict_dir, db=getattr(builder, 'db', None))
+        return cls(builder, JoinCache(cache_path, fingerprint, **kwargs))
+
+    def join_words(self, word1, word2, profile=None):
+        key = profile or ''
+        word1, word2 = normalize_input(word1), normalize_input(word2)  # One cache entry per spelling
+        output = self.cache.get(word1, word2, key)
+        if output is None:
+            output = self.builder.join_words(word1, word2, profile=profile)
+            self.cache.put(word1, word2, output, key)
+        return output
+
+    def __getattr__(self, name):
+        # Everything else (hint_engine, root_words, decline, ...) comes from the builder
+        return getattr(self.builder, name)
@@ -0,0 +1,100 @@
+import numpy as np
+
+class LexiconFeatures:
+    def __init__(self, root_words, get_last_swara, segmenter):
+        """
+        Columnar view of the lexicon, built once at load time.
+        Row i of every column describes self.words[i]:
+            last_swara / first_swara / word_type -> integer codes into the matching vocabulary
+            length                               -> number of aksharas
+        """
+        self.words = list(root_words.keys())
+        self.index = {word: i for i, word in enumerate(self.words)}
+
+        last, first, types, lengths = [], [], [], []
+        for word, row in root_words.items():
+            seg = segmenter.analyse(word)
+            last.append(get_last_swara(word))
+            first.append(seg.first_swara)
+            types.append(row.get('word_type') or '')
+            lengths.append(len(seg.bounds))
+
+        self.last_swara_vocab, self.last_swara = self._encode(last)
+        self.first_swara_vocab, self.first_swara = self._encode(first)
+        self.word_type_vocab, self.word_type = self._encode(types)
+        self.length = np.array(lengths, dtype=np.int16)
+
+        # Read-only columns: safe to share between threads
+        self.words = tuple(self.words)
+        for column in (self.last_swara, self.first_swara, self.word_type, self.length):
+            column.flags.writeable = False
+
+    @classmethod
+    def from_columns(cls, words, index, vocabs, columns):
+        """
+        Wraps already encoded columns (e.g. read-only views of a shared lexicon file)
+        without touching the words. vocabs / columns follow last_swara, first_swara,
+        word_type (, length).
+        """
+        features = cls.__new__(cls)
+        features.words = words
+        features.index = index
+        features.last_swara_vocab, features.first_swara_vocab, features.word_type_vocab = vocabs
+        features.last_swara, features.first_swara, features.word_type, features.length = columns
+        return features
+
+    @staticmethod
+    def _encode(values):
+        """Dictionary-encodes a column: returns (vocabulary tuple, int16 code array)."""
+        vocab = tuple(sorted(set(values)))
+        lookup = {value: code for code, value in enumerate(vocab)}
+        codes = np.fromiter((lookup[v] for v in values), dtype=np.int16, count=len(values))
+        return vocab, codes
+
+    @staticmethod
+    def _match(column, vocab, wanted):
+        """Boolean mask for rows whose value is `wanted` (a single value or a collection)."""
+        if isinstance(wanted, str):
+            wanted = [wanted]
+        codes = [vocab.index(v) for v in wanted if v in vocab]
+        return np.isin(column, codes)
+
+    def mask(self, last_swara=None, first_swara=None, word_type=None, min_length=None, max_length=None):
+        """
+        Vectorized filter over the lexicon. Every argument is optional and they are AND-ed.
+        Example: all 'ಉ'-ending nouns longer than two aksharas
+            features.mask(last_swara='ಉ', word_type='noun', min_length=3)
+        """
+        mask = np.ones(len(self.words), dtype=bool)
+        if last_swara is not None:
+            mask &= self._match(self.last_swara, self.last_swara_vocab, last_swara)
+        if first_swara is not None:
+            mask &= self._match(self.first_swara, self.first_swara_vocab, first_swara)
+        if word_type is not None:
+            mask &= self._match(self.word_type, self.word_type_vocab, word_type)
+        if min_length is not None:
+            mask &= self.length >= min_length
+        if max_length is not None:
+            mask &= self.length <= max_length
+        return mask
+
+    def select(self, **filters):
+        """Returns the words matching mask(**filters), in dictionary order."""
+        return [self.words[i] for i in np.flatnonzero(self.mask(**filters))]
+
+    def counts(self, column, mask=None):
+        """
+        Corpus statistics: {value: count} for 'last_swara', 'first_swara' or 'word_type'.
+        """
+        codes = getattr(self, column)
+        vocab = getattr(self, column + '_vocab')
+        if mask is not None:
+            codes = codes[mask]
+        totals = np.bincount(codes, minlength=len(vocab))
+        return {vocab[i]: int(n) for i, n in enumerate(totals) if n}
+
+    def length_histogram(self, mask=None):
+        """Returns {akshara_length: count}."""
+        lengths = self.length if mask is None else self.length[mask]
+        totals = np.bincount(lengths)
+        return {i: int(n) for i, n in enumerate(totals) if n}
@@ -0,0 +1,272 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from text_normalizer import normalize_input
+from word_joiner import KannadaWordBuilder
+
+# --- FILE LAYOUT ---
+# header | edge starts (uint32[n+1]) | final class (uint16[n]) | edge labels (uint32[e]) | edge targets (uint32[e]) | tables
+# States are a minimized acyclic automaton over the root words (code points); a final state
+# carries the root's ending-sound class. 'tables' is UTF-8 JSON: classes, markers and the
+# class x marker suffix matrix, i.e. the output emitted on the marker transition.
+MAGIC = b'KNFST003'  # 002: roots are the builder's normalized keys; 003: nukta kept
+HEADER = struct.Struct('<8sQQQQQQQQ')
+NOT_FINAL = 0xFFFF
+
+def _align(n):
+    return (n + 7) & ~7
+
+# --- COMPILER ---
+class _Minimizer:
+    def __init__(self):
+        """Incremental construction of a minimal automaton from sorted words (Daciuk et al.)."""
+        self.transitions = [{}]
+        self.finals = [NOT_FINAL]
+        self.register = {}
+        self.previous = ''
+        self.path = [0]  # states along the previous word
+
+    def _replace_or_register(self, down_to):
+        # Suffix states of the previous word below the common prefix can no longer change
+        for depth in range(len(self.path) - 1, down_to, -1):
+            child, parent = self.path[depth], self.path[depth - 1]
+            key = (self.finals[child], tuple(sorted(self.transitions[child].items())))
+            existing = self.register.get(key)
+            if existing is None:
+                self.register[key] = child
+            else:
+                self.transitions[parent][self.previous[depth - 1]] = existing
+        del self.path[down_to + 1:]
+
+    def add(self, word, final):
+        common = 0
+        limit = min(len(word), len(self.previous))
+        while common < limit and word[common] == self.previous[common]:
+            common += 1
+        self._replace_or_register(common)
+        state = self.path[common]
+        for char in word[common:]:
+            nxt = len(self.transitions)
+            self.transitions.append({})
+            self.finals.append(NOT_FINAL)
+            self.transitions[state][char] = nxt
+            self.path.append(nxt)
+            state = nxt
+        self.finals[state] = final
+        self.previous = word
+
+    def finish(self):
+        self._replace_or_register(0)
+        # Renumber the reachable states (merged duplicates are dropped)
+        order, ids = [0], {0: 0}
+        for state in order:
+            for _, target in sorted(self.transitions[state].items()):
+                if target not in ids:
+                    ids[target] = len(order)
+                    order.append(target)
+        return order, ids
+
+def compile_fst(builder, fst_path):
+    """
+    Compiles builder's lexicon and paradigm markers into a minimized transducer file.
+    (root, marker) -> root + suffix, where the suffix depends only on the root's ending
+    sound, exactly as in _apply_vibhakti. Returns: {'roots', 'states', 'edges', 'classes', 'markers'}
+    """
+    roots = sorted(word for word in builder.root_words if word)
+    last_sounds = {word: builder._get_last_swara(word) for word in roots}
+    classes = sorted(set(last_sounds.values()))
+    class_ids = {sound: i for i, sound in enumerate(classes)}
+    markers = list(builder.paradigm_markers)
+    suffixes = [[suffix for _, suffix in builder._paradigm_suffixes(sound)] for sound in classes]
+
+    minimizer = _Minimizer()
+    for word in roots:
+        minimizer.add(word, class_ids[last_sounds[word]])
+    order, ids = minimizer.finish()
+
+    starts, finals, labels, targets = [0], [], [], []
+    for state in order:
+        for char, target in sorted(minimizer.transitions[state].items()):
+            labels.append(ord(char))
+            targets.append(ids[target])
+        starts.append(len(labels))
+        finals.append(minimizer.finals[state])
+
+    tables = json.dumps({'profile': builder.profile_name, 'classes': classes, 'markers': markers,
+                         'suffixes': suffixes}, ensure_ascii=False).encode('utf-8')
+    n, e = len(order), len(labels)
+    starts_off = _align(HEADER.size)
+    finals_off = _align(starts_off + 4 * (n + 1))
+    labels_off = _align(finals_off + 2 * n)
+    targets_off = _align(labels_off + 4 * e)
+    tables_off = _align(targets_off + 4 * e)
+
+    os.makedirs(os.path.dirname(os.path.abspath(fst_path)), exist_ok=True)
+    tmp_path = fst_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(roots), n, e, starts_off, finals_off, labels_off, targets_off, tables_off))
+        for offset, data in (
+            (starts_off, struct.pack(f'<{n + 1}I', *starts)),
+            (finals_off, struct.pack(f'<{n}H', *finals)),
+            (labels_off, struct.pack(f'<{e}I', *labels)),
+            (targets_off, struct.pack(f'<{e}I', *targets)),
+            (tables_off, tables),
+        ):
+            f.seek(offset)
+            f.write(data)
+    os.replace(tmp_path, fst_path)
+    return {'roots': len(roots), 'states': n, 'edges': e, 'classes': len(classes), 'markers': len(markers)}
+
+# --- RUNTIME ---
+class LexiconFST:
+    def __init__(self, fst_path):
+        """
+        Read-only, memory-mapped transducer. Both directions walk the same states:
+        generate() reads the root then emits the marker's suffix for the final state's class,
+        analyze() reads a surface form and, at every root boundary, matches the rest
+        against that class's suffixes.
+        """
+        self.path = fst_path
+        self._file = open(fst_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mm)
+
+        (magic, self.root_count, n, e, starts_off, finals_off, labels_off,
+         targets_off, tables_off) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a lexicon FST: {fst_path}")
+        self.state_count, self.edge_count = n, e
+        self._starts = view[starts_off:starts_off + 4 * (n + 1)].cast('I')
+        self._finals = view[finals_off:finals_off + 2 * n].cast('H')
+        self._labels = view[labels_off:labels_off + 4 * e].cast('I')
+        self._targets = view[targets_off:targets_off + 4 * e].cast('I')
+
+        tables = json.loads(bytes(view[tables_off:]).decode('utf-8'))
+        self.profile_name = tables['profile']
+        self.classes = tables['classes']
+        self.markers = tables['markers']
+        self._marker_ids = {marker: i for i, marker in enumerate(self.markers)}
+        self._suffixes = tables['suffixes']
+        # Inverse of the output table: class -> {suffix: (marker, ...)} in marker order
+        self._by_suffix = []
+        for row in self._suffixes:
+            inverse = {}
+            for marker, suffix in zip(self.markers, row):
+                inverse.setdefault(suffix, []).append(marker)
+            self._by_suffix.append({suffix: tuple(found) for suffix, found in inverse.items()})
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        for view in (self._starts, self._finals, self._labels, self._targets, self._view):
+            view.release()
+        self._mm.close()
+        self._file.close()
+
+    def _step(self, state, char):
+        lo, hi = self._starts[state], self._starts[state + 1]
+        i = bisect_left(self._labels, ord(char), lo, hi)
+        if i < hi and self._labels[i] == ord(char):
+            return self._targets[i]
+        return None
+
+    def _final_class(self, word):
+        state = 0
+        for char in word:
+            state = self._step(state, char)
+            if state is None:
+                return NOT_FINAL
+        return self._finals[state]
+
+    def __contains__(self, word):
+        return self._final_class(word) != NOT_FINAL
+
+    def __len__(self):
+        return self.root_count
+
+    # --- BOTH DIRECTIONS ---
+    def generate(self, root, marker):
+        """Surface form of a lexicon root with a marker; None for unknown roots or markers."""
+        root, m = normalize_input(root), self._marker_ids.get(normalize_input(marker))
+        if m is None:
+            return None
+        cls = self._final_class(root)
+        if cls == NOT_FINAL:
+            return None
+        return root + self._suffixes[cls][m]
+
+    def paradigm(self, root):
+        """[(marker, surface), ...] for every marker, or [] for unknown roots."""
+        root = normalize_input(root)
+        cls = self._final_class(root)
+        if cls == NOT_FINAL:
+            return []
+        return [(marker, root + suffix) for marker, suffix in zip(self.markers, self._suffixes[cls])]
+
+    def analyze(self, surface):
+        """
+        Every (root, marker) the transducer maps onto surface, shortest root first.
+        Returns: [{'root', 'marker', 'rule'}, ...]
+        """
+        surface = normalize_input(surface)
+        found = []
+        state = 0
+        for i, char in enumerate(surface):
+            state = self._step(state, char)
+            if state is None:
+                break
+            cls = self._finals[state]
+            if cls != NOT_FINAL:
+                for marker in self._by_suffix[cls].get(surface[i + 1:], ()):
+                    found.append({'root': surface[:i + 1], 'marker': marker, 'rule': f"Vibhakti: {marker}"})
+        return found
+
+# --- EQUIVALENCE CHECK ---
+def verify(fst, builder, words=None):
+    """
+    Compares the transducer with the Python path for every root x marker:
+    generate() against join_words(), and analyze() must give the pair back.
+    Returns: {'checked', 'mismatches': [(root, marker, expected, got), ...]}
+    """
+    words = list(builder.root_words) if words is None else list(words)
+    mismatches = []
+    checked = 0
+    for word in words:
+        for marker in fst.markers:
+            checked += 1
+            expected = builder.join_words(word, marker)['result']
+            got = fst.generate(word, marker)
+            readings = {(a['root'], a['marker']) for a in fst.analyze(expected)}
+            if got != expected or (word, marker) not in readings:
+                mismatches.append((word, marker, expected, got))
+    return {'checked': checked, 'mismatches': mismatches}
+
+def main():
+    usage = (f"Usage: python {os.path.basename(__file__)} build <lexicon.fst> [profile]\n"
+             f"       python {os.path.basename(__file__)} verify <lexicon.fst>")
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ('build', 'verify'):
+        print(usage)
+        sys.exit(1)
+    builder = KannadaWordBuilder()
+    if sys.argv[1] == 'build':
+        profile = builder.profile(sys.argv[3] if len(sys.argv) == 4 else None)
+        stats = compile_fst(profile, sys.argv[2])
+        print(f"✅ {stats['roots']} roots x {stats['markers']} markers -> {stats['states']} states, "
+              f"{stats['edges']} edges ({os.path.getsize(sys.argv[2])} bytes)")
+        return
+
+    started = time.perf_counter()
+    fst = LexiconFST(sys.argv[2])
+    print(f"--- Loaded {sys.argv[2]} in {(time.perf_counter() - started) * 1000:.2f} ms ---")
+    report = verify(fst, builder.profile(fst.profile_name))
+    for word, marker, expected, got in report['mismatches'][:20]:
+        print(f"❌ {word} + {marker}: expected {expected}, got {got}")
+    print(f"{'✅' if not report['mismatches'] else '❌'} {report['checked'] - len(report['mismatches'])}"
+          f"/{report['checked']} root x marker forms match join_words")
+    sys.exit(1 if report['mismatches'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from bench_concurrency import make_workload
+from regression_diff import iter_pairs
+
+# --- TARGETS ---
+class InProcessTarget:
+    def __init__(self, dict_dir=None):
+        from word_joiner import KannadaWordBuilder
+        self.builder = KannadaWordBuilder(dict_dir)
+        self.name = f"in-process ({self.builder.dict_dir})"
+
+    def __call__(self, word1, word2):
+        return self.builder.join_words(word1, word2)
+
+class HttpTarget:
+    def __init__(self, url, timeout=10.0):
+        """
+        Local endpoint called as GET url?word1=..&word2=.. (or with {word1}/{word2}
+        placeholders in the url); a JSON body with a 'status' field is expected.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.name = url
+
+    def __call__(self, word1, word2):
+        if '{word1}' in self.url:
+            url = self.url.format(word1=urllib.parse.quote(word1), word2=urllib.parse.quote(word2))
+        else:
+            sep = '&' if '?' in self.url else '?'
+            url = self.url + sep + urllib.parse.urlencode({'word1': word1, 'word2': word2})
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+# --- STATISTICS ---
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+def latency_summary(seconds):
+    values = sorted(seconds)
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        'p50': ms(percentile(values, 50)),
+        'p95': ms(percentile(values, 95)),
+        'p99': ms(percentile(values, 99)),
+        'max': ms(values[-1]) if values else 0.0,
+        'mean': ms(sum(values) / len(values)) if values else 0.0,
+    }
+
+# --- LOAD GENERATOR ---
+def run_load(target, pairs, concurrency=8, rate=None, requests=None, duration=None, seed=7):
+    """
+    Replays pairs (cycled) against target from `concurrency` threads.
+        - rate=None: closed loop, every thread sends back to back (max throughput)
+        - rate=R: open loop, Poisson arrivals at R req/s; latency is measured from the
+          scheduled arrival, so queueing behind a slow request is counted (no coordinated omission)
+    Stops after `requests` requests or `duration` seconds, whichever comes first.
+    """
+    if not pairs:
+        raise ValueError("No word pairs to replay")
+    requests = requests or (None if duration else len(pairs))
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    next_index = [0]
+    next_arrival = [0.0]
+    latencies, service_times = [], []
+    errors = Counter()
+
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    def claim():
+        # Hands out the next request index and (open loop) its scheduled start time
+        with lock:
+            i = next_index[0]
+            if requests is not None and i >= requests:
+                return None, None
+            next_index[0] += 1
+            if rate:
+                next_arrival[0] += rng.expovariate(rate)
+                return i, started + next_arrival[0]
+            return i, None
+
+    def worker():
+        local_latency, local_service, local_errors = [], [], Counter()
+        while True:
+            i, scheduled = claim()
+            if i is None:
+                break
+            now = time.perf_counter()
+            if scheduled is not None and scheduled > now:
+                time.sleep(scheduled - now)
+            if deadline and time.perf_counter() >= deadline:
+                break
+            word1, word2 = pairs[i % len(pairs)]
+            sent = time.perf_counter()
+            try:
+                output = target(word1, word2)
+                if output.get('status') == 'error':
+                    local_errors['status_error'] += 1
+            except urllib.error.HTTPError as e:
+                local_errors[f"http_{e.code}"] += 1
+            except Exception as e:
+                local_errors[type(e).__name__] += 1
+            finished = time.perf_counter()
+            local_service.append(finished - sent)
+            local_latency.append(finished - (scheduled if scheduled is not None else sent))
+        with lock:
+            latencies.extend(local_latency)
+            service_times.extend(local_service)
+            errors.update(local_errors)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    completed = len(latencies)
+    return {
+        'target': target.name,
+        'python': sys.version.split()[0],
+        'cpus': os.cpu_count(),
+        'concurrency': concurrency,
+        'mode': 'open' if rate else 'closed',
+        'target_rate_rps': rate,
+        'requests': completed,
+        'errors': sum(errors.values()),
+        'error_kinds': dict(errors),
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': latency_summary(latencies),
+        'service_ms': latency_summary(service_times),
+    }
+
+def compare_reports(before, after):
+    """Ratios after/before (<1 is better for latency, >1 is better for throughput)."""
+    ratio = lambda a, b: round(a / b, 3) if b else None
+    return {
+        'throughput_rps': ratio(after['throughput_rps'], before['throughput_rps']),
+        'latency_ms': {k: ratio(after['latency_ms'][k], before['latency_ms'][k]) for k in ('p50', 'p95', 'p99')},
+        'errors': after['errors'] - before['errors'],
+    }
+
+def load_pairs(args, builder=None):
+    if args.pairs:
+        return list(iter_pairs(args.pairs))
+    if builder is None:
+        from word_joiner import KannadaWordBuilder
+        builder = KannadaWordBuilder(args.dict_dir)
+    return make_workload(builder, args.synthetic, seed=args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay (word1, word2) requests and report latency percentiles.")
+    parser.add_argument('--pairs', help="Recorded CSV of word pairs (default: synthetic lexicon mix)")
+    parser.add_argument('--synthetic', type=int, default=20000, help="Size of the synthetic mix")
+    parser.add_argument('--url', help="Local endpoint instead of an in-process builder")
+    parser.add_argument('--dict-dir', default=None, help="Dictionaries folder for the in-process builder")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=None, help="Open-loop arrival rate in req/s (default: closed loop)")
+    parser.add_argument('--requests', type=int, default=None, help="Requests to send (default: one pass over the pairs)")
+    parser.add_argument('--duration', type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--baseline', help="Earlier JSON report to compare against")
+    parser.add_argument('--out', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget(args.dict_dir)
+    pairs = load_pairs(args, getattr(target, 'builder', None))
+    print(f"--- 📈 Load test: {len(pairs)} pairs -> {target.name} (x{args.concurrency}) ---", file=sys.stderr)
+
+    report = run_load(target, pairs, args.concurrency, args.rate, args.requests, args.duration, args.seed)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['vs_baseline'] = compare_reports(json.load(f), report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,18 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DICT_DIR = os.path.join(BASE_DIR, 'dictionaries')
 
+def append_new_rows(filepath, rows):
+    """Appends only rows not already in the CSV, so running a script twice adds nothing."""
+    existing = set()
+    if os.path.exists(filepath):
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            existing = {tuple(row) for row in csv.reader(f)}
+    new_rows = [row for row in rows if tuple(row) not in existing]
+    with open(filepath, 'a', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerows(new_rows)
+    return len(new_rows)
+
 def populate_sandhi_rules():
     """Populates sandhi_rules.csv with rules from Problem Statement (Source: Page 2, 10)"""
     filepath = os.path.join(DICT_DIR, 'sandhi_rules.csv')
@@ -20,10 +32,8 @@ def populate_sandhi_rules():
         ["6", "ಆ", "ಉ", "ಓ", "ಸೂರ್ಯ", "ಉದಯ", "ಸೂರ್ಯೋದಯ"],  # Guna Sandhi
     ]
 
-    with open(filepath, 'a', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerows(rules)
-    print(f"✅ Added {len(rules)} Sandhi rules to {filepath}")
+    added = append_new_rows(filepath, rules)
+    print(f"✅ Added {added} Sandhi rules to {filepath}")
 
 def populate_vibhakti_rules():
     """Populates vibhakti_rules.csv with case markers (Source: Page 2-3, 47-48)"""
@@ -39,10 +49,8 @@ def populate_vibhakti_rules():
         ["ದ", "possessive", "ಮರ", "add_da", "ಮರದ"] # Extra common one
     ]
 
-    with open(filepath, 'a', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerows(markers)
-    print(f"✅ Added {len(markers)} Vibhakti rules to {filepath}")
+    added = append_new_rows(filepath, markers)
+    print(f"✅ Added {added} Vibhakti rules to {filepath}")
 
 def populate_root_words():
     """Populates root_words.csv with the initial examples (Source: Page 1-2, 28-33)"""
@@ -62,10 +70,8 @@ def populate_root_words():
         ["ಉಪದೇಶ", "advice", "noun", "ಅ", "yes"]
     ]
 
-    with open(filepath, 'a', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerows(words)
-    print(f"✅ Added {len(words)} root words to {filepath}")
+    added = append_new_rows(filepath, words)
+    print(f"✅ Added {added} root words to {filepath}")
 
 if __name__ == "__main__":
     print("--- Populating Baseline Data from PDF ---")
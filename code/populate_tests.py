@@ -3,9 +3,9 @@ import os
 import random
 from word_joiner import KannadaWordBuilder
 
-def populate_test_csv():
+def populate_test_csv(base_dir=None):
     # 1. Setup Paths
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    base_dir = base_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     file_path = os.path.join(base_dir, 'test cases', 'word_pairs_test.csv')
 
     print(f"--- 🏭 Generative Testing Engine ---")
@@ -13,7 +13,7 @@ def populate_test_csv():
 
     # 2. Initialize the "Brain" to calculate correct answers
     try:
-        builder = KannadaWordBuilder()
+        builder = KannadaWordBuilder(os.path.join(base_dir, 'dictionaries'))
     except ImportError:
         print("Error: Could not load word_joiner.py. Make sure it is in the same folder.")
         return
@@ -59,8 +59,8 @@ def populate_test_csv():
     # 50 words * 8 suffixes = 400 test cases!
     print("   ... Generating Vibhakti Permutations")
     
-    # Filter for good root words (exclude junk)
-    valid_roots = [w for w in builder.root_words.keys() if len(w) > 2]
+    # Filter for good root words (exclude junk): at least 2 aksharas
+    valid_roots = builder.features.select(min_length=2)
     valid_roots = valid_roots[:100] # Take top 100 words
     
     markers = list(builder.vibhakti_markers.keys())
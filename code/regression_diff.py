@@ -0,0 +1,210 @@
+import argparse
+import csv
+import io
+import json
+import multiprocessing as mp
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from collections import Counter
+from itertools import chain
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_DIR = os.path.join(BASE_DIR, 'code')
+
+CHUNK_SIZE = 5000
+
+# --- VERSION RESOLUTION ---
+def resolve_version(spec, workdir):
+    """
+    Turns a version spec into (code_dir, dict_dir):
+        - a dictionaries folder (contains root_words.csv) -> current code + that folder
+        - a checkout/snapshot folder (contains code/ and dictionaries/) -> its own code + data
+        - anything else is treated as a git revision (HEAD~1, a tag, a commit) and exported
+    """
+    if os.path.isfile(os.path.join(spec, 'root_words.csv')):
+        return CODE_DIR, os.path.abspath(spec)
+    if os.path.isdir(os.path.join(spec, 'code')) and os.path.isdir(os.path.join(spec, 'dictionaries')):
+        return os.path.join(os.path.abspath(spec), 'code'), os.path.join(os.path.abspath(spec), 'dictionaries')
+
+    target = tempfile.mkdtemp(prefix='snapshot_', dir=workdir)
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', spec, 'code', 'dictionaries'],
+        cwd=BASE_DIR, capture_output=True, check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return os.path.join(target, 'code'), os.path.join(target, 'dictionaries')
+
+# --- WORKERS (one pool per version, so each pool imports its own code) ---
+_builder = None
+
+def _init_worker(code_dir, dict_dir):
+    global _builder
+    sys.path.insert(0, code_dir)
+    from word_joiner import KannadaWordBuilder
+    try:
+        _builder = KannadaWordBuilder(dict_dir)
+    except TypeError:
+        # Older snapshots only load the dictionaries next to their own code
+        _builder = KannadaWordBuilder()
+
+def _join_chunk(pairs):
+    out = []
+    for word1, word2 in pairs:
+        try:
+            output = _builder.join_words(word1, word2)
+            out.append((output.get('result', ''), output.get('status', ''), output.get('rule') or output.get('msg', '')))
+        except Exception as e:
+            out.append(('', 'error', f"{type(e).__name__}: {e}"))
+    return out
+
+# --- CORPUS ---
+def iter_pairs(path):
+    """Streams (word1, word2) pairs from a CSV ('word1'/'word2' columns or the first two)."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        lowered = [cell.strip().lower() for cell in header]
+        if 'word1' in lowered and 'word2' in lowered:
+            i1, i2 = lowered.index('word1'), lowered.index('word2')
+        else:
+            i1, i2 = 0, 1
+            if len(header) > 1:
+                yield header[0].strip(), header[1].strip()
+        for row in reader:
+            if len(row) > max(i1, i2):
+                yield row[i1].strip(), row[i2].strip()
+
+def synthetic_pairs(dict_dir, count, seed=42):
+    """Random lexicon pairs mixed with (root, case marker) pairs."""
+    with open(os.path.join(dict_dir, 'root_words.csv'), 'r', encoding='utf-8-sig') as f:
+        words = [row['word'] for row in csv.DictReader(f) if row.get('word')]
+    with open(os.path.join(dict_dir, 'vibhakti_rules.csv'), 'r', encoding='utf-8-sig') as f:
+        markers = [row['marker'] for row in csv.DictReader(f) if row.get('marker')]
+    rng = random.Random(seed)
+    for i in range(count):
+        word2 = rng.choice(markers) if markers and i % 3 == 0 else rng.choice(words)
+        yield rng.choice(words), word2
+
+def _chunks(pairs, size):
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# --- DIFF ---
+def run_diff(old_spec, new_spec, pairs, changes_path=None, processes=None, workdir=None):
+    """
+    Joins every pair with both versions and reports the changed results,
+    grouped by the rule that fired (old rule -> new rule).
+    """
+    processes = processes or os.cpu_count() or 2
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='regression_')
+    old_code, old_dict = resolve_version(old_spec, workdir)
+    new_code, new_dict = resolve_version(new_spec, workdir)
+
+    ctx = mp.get_context('spawn')  # Fresh interpreters: the two versions must not share modules
+    per_pool = max(1, processes // 2)
+    old_pool = ctx.Pool(per_pool, _init_worker, (old_code, old_dict))
+    new_pool = ctx.Pool(per_pool, _init_worker, (new_code, new_dict))
+
+    total = 0
+    changed = 0
+    by_rule = Counter()
+    by_status = Counter()
+    samples = {}
+    started = time.perf_counter()
+
+    changes_file = open(changes_path, 'w', newline='', encoding='utf-8-sig') if changes_path else None
+    writer = csv.writer(changes_file) if changes_file else None
+    if writer:
+        writer.writerow(['word1', 'word2', 'old_result', 'new_result', 'old_status', 'new_status', 'old_rule', 'new_rule'])
+
+    try:
+        chunks = _chunks(pairs, CHUNK_SIZE)
+        window = per_pool * 4  # Bounded number of chunks in flight
+        while True:
+            batch = [chunk for _, chunk in zip(range(window), chunks)]
+            if not batch:
+                break
+            old_async = old_pool.map_async(_join_chunk, batch)
+            new_async = new_pool.map_async(_join_chunk, batch)
+            for chunk, old_out, new_out in zip(batch, old_async.get(), new_async.get()):
+                for (word1, word2), old, new in zip(chunk, old_out, new_out):
+                    total += 1
+                    if old == new:
+                        continue
+                    changed += 1
+                    key = old[2] if old[2] == new[2] else f"{old[2]} -> {new[2]}"
+                    by_rule[key] += 1
+                    by_status[f"{old[1]} -> {new[1]}"] += 1
+                    samples.setdefault(key, [word1, word2, old[0], new[0]])
+                    if writer:
+                        writer.writerow([word1, word2, old[0], new[0], old[1], new[1], old[2], new[2]])
+            print(f"   ... {total} pairs compared, {changed} changed")
+    finally:
+        old_pool.terminate()
+        new_pool.terminate()
+        if changes_file:
+            changes_file.close()
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'old': old_spec,
+        'new': new_spec,
+        'total_pairs': total,
+        'changed': changed,
+        'changed_pct': round(changed / total * 100, 4) if total else 0.0,
+        'elapsed_sec': round(elapsed, 2),
+        'pairs_per_sec': round(total / elapsed) if elapsed > 0 else 0,
+        'by_rule': dict(by_rule.most_common()),
+        'by_status': dict(by_status.most_common()),
+        'examples': samples,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare join results of two dictionary/rule versions.")
+    parser.add_argument('old', help="Old version: dictionaries folder, snapshot folder or git revision")
+    parser.add_argument('new', nargs='?', default=BASE_DIR, help="New version (default: working tree)")
+    parser.add_argument('--pairs', help="CSV corpus of word pairs (default: test cases/word_pairs_test.csv)")
+    parser.add_argument('--synthetic', type=int, default=0, help="Add N random lexicon pairs to the corpus")
+    parser.add_argument('--changes', help="Write every changed pair to this CSV")
+    parser.add_argument('--report', help="Write the JSON summary to this file")
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    pairs_path = args.pairs or os.path.join(BASE_DIR, 'test cases', 'word_pairs_test.csv')
+    corpus = iter_pairs(pairs_path)
+    if args.synthetic:
+        corpus = chain(corpus, synthetic_pairs(os.path.join(BASE_DIR, 'dictionaries'), args.synthetic))
+
+    print(f"--- 🔍 Regression diff: {args.old} -> {args.new} ---")
+    report = run_diff(args.old, args.new, corpus, args.changes, args.processes)
+
+    print(f"\nCompared: {report['total_pairs']} pairs in {report['elapsed_sec']}s ({report['pairs_per_sec']} pairs/s)")
+    print(f"Changed:  {report['changed']} ({report['changed_pct']}%)")
+    for rule, count in list(report['by_rule'].items())[:20]:
+        print(f"   {count:>8}  {rule}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ Report saved to {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("kannada_word_builder.reruns")
+
+class RerunTimer:
+    def __init__(self, window=2000):
+        """
+        Server-side timing of Streamlit script runs, shared by all sessions.
+        Keeps the last `window` durations per kind ('full', 'fragment:join', ...).
+        """
+        self.window = window
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds):
+        with self._lock:
+            samples = self._samples.get(kind)
+            if samples is None:
+                samples = self._samples[kind] = deque(maxlen=self.window)
+                self._totals[kind] = [0, 0.0]
+            samples.append(seconds)
+            self._totals[kind][0] += 1
+            self._totals[kind][1] += seconds
+        logger.debug("%s rerun: %.1f ms", kind, seconds * 1000)
+
+    @contextmanager
+    def measure(self, kind):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, time.perf_counter() - started)
+
+    def summary(self):
+        """{kind: {'runs', 'total_s', 'p50_ms', 'p95_ms', 'max_ms'}} over the recent window"""
+        with self._lock:
+            snapshot = {kind: (sorted(samples), tuple(self._totals[kind])) for kind, samples in self._samples.items()}
+        report = {}
+        for kind, (samples, (runs, total)) in snapshot.items():
+            last = len(samples) - 1
+            report[kind] = {
+                'runs': runs,
+                'total_s': round(total, 3),
+                'p50_ms': round(samples[last // 2] * 1000, 2),
+                'p95_ms': round(samples[last * 95 // 100] * 1000, 2),
+                'max_ms': round(samples[last] * 1000, 2),
+            }
+        return report
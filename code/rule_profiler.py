@@ -0,0 +1,200 @@
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from regression_diff import iter_pairs
+from text_normalizer import normalize_input
+
+# --- STATIC ANALYSIS ---
+def shadowed_rules(builder):
+    """
+    Rows that first-match order makes unreachable (or partly so), from the tables alone:
+        sandhi sound match  -> an earlier row has the same (sound1, sound2); rows without
+                               a sound pair (profile overlays) are exact-match only
+        sandhi exact match  -> an earlier row has the same example pair, or example_word2 is a
+                               case marker (join_words takes the vibhakti branch first)
+        samasa              -> an earlier suffix_to_drop ends every word this one ends
+    Returns: {'sandhi': [...], 'samasa': [...]}
+    """
+    sandhi, first_sound, first_example = [], {}, {}
+    for i, rule in enumerate(builder.sandhi_rules):
+        entry = {'index': i, 'rule_number': rule['rule_number']}
+        sounds = (rule['sound1'], rule['sound2'])
+        example = (rule['example_word1'], rule['example_word2'])
+        if all(sounds):
+            if sounds in first_sound:
+                entry['sound_match_shadowed_by'] = first_sound[sounds]
+            else:
+                first_sound[sounds] = i
+        if example in first_example:
+            entry['exact_match_shadowed_by'] = first_example[example]
+        elif example[1] and _is_marker(builder, example[1]):
+            entry['exact_match_shadowed_by'] = 'vibhakti'
+        else:
+            first_example[example] = i
+        if len(entry) > 2:
+            sandhi.append(entry)
+
+    samasa = []
+    for i, rule in enumerate(builder.samasa_rules):
+        for j, earlier in enumerate(builder.samasa_rules[:i]):
+            if rule['suffix_to_drop'].endswith(earlier['suffix_to_drop']):
+                samasa.append({'index': i, 'rule_name': rule['rule_name'], 'suffix_to_drop': rule['suffix_to_drop'],
+                               'shadowed_by': j, 'by_suffix': earlier['suffix_to_drop']})
+                break
+    return {'sandhi': sandhi, 'samasa': samasa}
+
+def _is_marker(builder, word):
+    # Same test as the first branch of _join
+    return word in builder.vibhakti_markers or word.startswith("ಗಳ")
+
+# --- CORPUS PASS ---
+class RuleProfiler:
+    def __init__(self, builder):
+        """
+        Counts, for every pair joined, the branch of _join that answered and the table rows
+        behind it, as _join itself reports them (its trace), so the counts are the rules'
+        real hit counts. Samasa resolution happens before the sandhi branches and is
+        counted apart from them.
+        """
+        self.builder = builder
+        self.pairs = 0
+        self.skipped = 0           # Pairs with an empty word (after normalization)
+        self.branches = Counter()  # One branch per pair
+        self.markers = Counter()
+        self.samasa_resolved = 0
+        self.samasa = Counter()    # samasa row index -> hits
+        self.sandhi_sound = Counter()
+        self.sandhi_exact = Counter()
+        self.reached = Counter()   # (sound1, sound2) -> pairs that got to the sound match
+        self.fallback = Counter()  # (sound1, sound2) -> of which no rule matched
+        self.seconds = 0.0
+
+    def feed(self, pairs):
+        builder = self.builder
+        started = time.perf_counter()
+        for word1, word2 in pairs:
+            # The inputs join_words() hands to _join
+            word1, word2 = normalize_input(word1), normalize_input(word2)
+            if not word1 or not word2:
+                self.skipped += 1
+                continue
+            self.pairs += 1
+            trace = {}
+            builder._join(word1, word2, trace)
+            branch = trace['branch']
+            self.branches[branch] += 1
+            if 'samasa_row' in trace:
+                self.samasa_resolved += 1
+                self.samasa[trace['samasa_row']] += 1
+            if branch in ('vibhakti', 'vibhakti_plural'):
+                self.markers[word2] += 1
+            elif branch == 'exact_match':
+                self.sandhi_exact[trace['sandhi_row']] += 1
+            else:
+                sounds = trace['sounds']
+                self.reached[sounds] += 1
+                if branch == 'fallback':
+                    self.fallback[sounds] += 1
+                else:
+                    self.sandhi_sound[trace['sandhi_row']] += 1
+        self.seconds += time.perf_counter() - started
+        return self
+
+    def report(self):
+        builder = self.builder
+        shadowed = shadowed_rules(builder)
+        shadow_by_index = {entry['index']: entry for entry in shadowed['sandhi']}
+
+        rules = []
+        for i, rule in enumerate(builder.sandhi_rules):
+            entry = {
+                'index': i,
+                'rule_number': rule['rule_number'],
+                'sandhi_type': rule['sandhi_type'],
+                'sound1': rule['sound1'],
+                'sound2': rule['sound2'],
+                'result': rule['result'],
+                'sound_hits': self.sandhi_sound[i],
+                'exact_hits': self.sandhi_exact[i],
+            }
+            for key in ('sound_match_shadowed_by', 'exact_match_shadowed_by'):
+                if key in shadow_by_index.get(i, {}):
+                    entry[key] = shadow_by_index[i][key]
+            rules.append(entry)
+
+        reached_total = sum(self.reached.values())
+        classes = [
+            {'sound1': s1, 'sound2': s2, 'reached': n, 'fallback': self.fallback[(s1, s2)],
+             'rate': round(self.fallback[(s1, s2)] / n, 4)}
+            for (s1, s2), n in self.reached.items()
+        ]
+        classes.sort(key=lambda c: (-c['fallback'], -c['reached'], c['sound1'], c['sound2']))
+
+        markers = list(dict.fromkeys(builder.vibhakti_markers))
+        return {
+            'profile': builder.profile_name,
+            'pairs': self.pairs,
+            'skipped_empty': self.skipped,
+            'seconds': round(self.seconds, 3),
+            'branches': dict(self.branches.most_common()),
+            'samasa_resolved': self.samasa_resolved,
+            'fallback_rate': round(self.branches['fallback'] / reached_total, 4) if reached_total else 0.0,
+            'fallback_by_class': classes,
+            'markers': {m: self.markers[m] for m in markers} | {m: n for m, n in self.markers.items() if m not in markers},
+            'samasa': [{'index': i, 'rule_name': rule['rule_name'], 'suffix_to_drop': rule['suffix_to_drop'],
+                        'hits': self.samasa[i]} for i, rule in enumerate(builder.samasa_rules)],
+            'sandhi_rules': rules,
+            'never_fired': {
+                'sandhi': [r['index'] for r in rules if not r['sound_hits'] and not r['exact_hits']],
+                'markers': [m for m in markers if not self.markers[m]],
+                'samasa': [i for i in range(len(builder.samasa_rules)) if not self.samasa[i]],
+            },
+            'shadowed': shadowed,
+        }
+
+def print_summary(report, limit=10):
+    print(f"   Pairs: {report['pairs']} in {report['seconds']:.2f}s (profile: {report['profile']})")
+    for branch, n in report['branches'].items():
+        print(f"   {branch:>18}: {n} ({n / max(report['pairs'], 1):.1%})")
+    print(f"   Samasa suffix resolved first: {report['samasa_resolved']} ({report['samasa_resolved'] / max(report['pairs'], 1):.1%})")
+    print(f"   Fallback rate at the sound match: {report['fallback_rate']:.1%}")
+    for c in report['fallback_by_class'][:limit]:
+        if c['fallback']:
+            print(f"      {c['sound1']} + {c['sound2']}: {c['fallback']}/{c['reached']} fell back")
+    shadowed = report['shadowed']
+    print(f"   Shadowed: {len(shadowed['sandhi'])} sandhi rows, {len(shadowed['samasa'])} samasa rows")
+    never = report['never_fired']
+    print(f"   Never fired: {len(never['sandhi'])} sandhi rows, {len(never['markers'])} markers, "
+          f"{len(never['samasa'])} samasa rows")
+
+def main():
+    parser = argparse.ArgumentParser(description="Branch, rule and marker hit counts of join_words over a corpus of pairs.")
+    parser.add_argument('--pairs', help="Recorded CSV of word pairs (default: synthetic lexicon mix)")
+    parser.add_argument('--synthetic', type=int, default=20000, help="Size of the synthetic mix")
+    parser.add_argument('--dict-dir', default=None)
+    parser.add_argument('--profile', default=None, help="Rule profile to measure (default: standard)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--out', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    from word_joiner import KannadaWordBuilder
+    builder = KannadaWordBuilder(args.dict_dir).profile(args.profile)
+    if args.pairs:
+        pairs = iter_pairs(args.pairs)
+    else:
+        from bench_concurrency import make_workload
+        pairs = make_workload(builder, args.synthetic, seed=args.seed)
+
+    print("--- 🔬 Rule coverage ---", file=sys.stderr)
+    report = RuleProfiler(builder).feed(pairs).report()
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print_summary(report)
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import re
 import csv
 import os
+import sys
 
 # Target: Kannada Wikipedia
 
@@ -44,12 +45,19 @@ def get_existing_words(filepath):
                     existing.add(row['word'])
     return existing
 
-def scrape_wikipedia():
+def scrape_wikipedia(db_path=None):
     # Construct absolute path to avoid "file not found" errors
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     FILE_PATH = os.path.join(BASE_DIR, 'dictionaries', 'root_words.csv')
     
-    existing_words = get_existing_words(FILE_PATH)
+    db = None
+    if db_path:
+        # Ingest straight into the SQLite dictionary (dictionary_db.py) instead of the CSV
+        from dictionary_db import DictionaryDB
+        db = DictionaryDB(db_path)
+        existing_words = set(db.root_words())
+    else:
+        existing_words = get_existing_words(FILE_PATH)
     new_words = set()
 
     print(f"Starting scrape... (Already have {len(existing_words)} words)")
@@ -89,7 +97,13 @@ def scrape_wikipedia():
     print(f"\nTotal new unique words found: {len(new_words)}")
 
     # Append to CSV
-    if new_words:
+    if new_words and db is not None:
+        # Format: word, meaning, word_type, last_sound, can_combine; never overwrites a curated row
+        rows = [[word, "TODO", "noun", "TODO", "yes"] for word in new_words]
+        inserted, _ = db.upsert('roots', rows, update=False)
+        db.close()
+        print(f"✅ Success! Inserted {inserted} words into {db_path}")
+    elif new_words:
         with open(FILE_PATH, 'a', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f)
             count = 0
@@ -102,4 +116,4 @@ def scrape_wikipedia():
         print("⚠️ No new words to add.")
 
 if __name__ == "__main__":
-    scrape_wikipedia()
\ No newline at end of file
+    scrape_wikipedia(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -0,0 +1,332 @@
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+import numpy as np
+from dictionary_db import row_dict
+from lexicon_features import LexiconFeatures
+from striped_cache import StripedCache
+
+# --- FILE LAYOUT ---
+# header | blob | record offsets (uint64[n+1]) | by_word (uint32[n]) | feature columns (int16[n] x 4) | tables
+# Records are 'word \x1f field \x1f field ...' (UTF-8) in root_words order; by_word holds record ids
+# in word order for binary search. The feature columns are LexiconFeatures' codes, and 'tables'
+# (UTF-8 JSON) holds their vocabularies, the three rule tables and the dictionary version.
+MAGIC = b'KNSHR003'  # 002: root keys normalized (normalize_word); 003: nukta kept
+HEADER = struct.Struct('<8sQQQQQQ')
+SEP = b'\x1f'
+FEATURE_COLUMNS = ('last_swara', 'first_swara', 'word_type', 'length')
+
+def _align(n):
+    return (n + 7) & ~7
+
+def _fields(row, header):
+    # Back to the raw CSV fields (DictReader only leaves trailing fields missing)
+    fields = [row[key] for key in header if row.get(key) is not None]
+    return fields + list(row.get(None, ()))
+
+def _header(rows):
+    for row in rows:
+        return [key for key in row if key is not None]
+    return []
+
+def publish(builder, shared_path, version=()):
+    """
+    Writes builder's lexicon, features and rule tables into one file that worker
+    processes map read-only (SharedLexicon). Written to a temp file and renamed,
+    so workers never see a half-written file.
+    """
+    words = list(builder.root_words)
+    rows = [builder.root_words[word] for word in words]
+    root_header = _header(rows)
+    encoded = [SEP.join(field.replace('\x1f', '').encode('utf-8')
+                        for field in [word, *_fields(row, root_header)]) for word, row in zip(words, rows)]
+    count = len(words)
+    by_word = sorted(range(count), key=lambda i: encoded[i].split(SEP, 1)[0])
+
+    features = builder.features
+    tables = {
+        'version': [list(v) for v in version],
+        'root_header': root_header,
+        'sandhi': [_header(builder.sandhi_rules), [_fields(r, _header(builder.sandhi_rules)) for r in builder.sandhi_rules]],
+        'markers': [_header(builder.vibhakti_markers.values()),
+                    [[k, _fields(r, _header(builder.vibhakti_markers.values()))] for k, r in builder.vibhakti_markers.items()]],
+        'samasa': [_header(builder.samasa_rules), [_fields(r, _header(builder.samasa_rules)) for r in builder.samasa_rules]],
+        'vocab': {column: list(getattr(features, column + '_vocab')) for column in FEATURE_COLUMNS[:3]},
+    }
+    columns = [np.asarray(getattr(features, column), dtype='<i2').tobytes() for column in FEATURE_COLUMNS]
+
+    blob = bytearray()
+    offsets = [0]
+    for record in encoded:
+        blob += record
+        offsets.append(len(blob))
+
+    blob_off = _align(HEADER.size)
+    rec_off = _align(blob_off + len(blob))
+    word_off = rec_off + 8 * (count + 1)
+    columns_off = _align(word_off + 4 * count)
+    tables_off = _align(columns_off + len(FEATURE_COLUMNS) * 2 * count)
+
+    os.makedirs(os.path.dirname(os.path.abspath(shared_path)), exist_ok=True)
+    tmp_path = f"{shared_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, count, blob_off, rec_off, word_off, columns_off, tables_off))
+        for offset, data in (
+            (blob_off, blob),
+            (rec_off, struct.pack(f'<{count + 1}Q', *offsets)),
+            (word_off, struct.pack(f'<{count}I', *by_word)),
+            (columns_off, b''.join(columns)),
+            (tables_off, json.dumps(tables, ensure_ascii=False).encode('utf-8')),
+        ):
+            f.seek(offset)
+            f.write(data)
+    os.replace(tmp_path, shared_path)
+
+class SharedLexicon:
+    def __init__(self, shared_path, cache_size=4096):
+        """
+        Read-only view of a published lexicon file. The OS keeps one copy of its pages
+        for every process that maps it; rows are decoded on access (small LRU in front).
+        """
+        self.path = shared_path
+        self._file = open(shared_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mm)
+
+        magic, n, blob_off, rec_off, word_off, columns_off, tables_off = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a shared lexicon: {shared_path}")
+        self.count = n
+        self._blob_off = blob_off
+        self._offsets = view[rec_off:rec_off + 8 * (n + 1)].cast('Q')
+        self._by_word = view[word_off:word_off + 4 * n].cast('I')
+        self._columns = [np.frombuffer(self._mm, dtype='<i2', count=n, offset=columns_off + 2 * n * i)
+                         for i in range(len(FEATURE_COLUMNS))]
+        self.tables = json.loads(bytes(view[tables_off:]).decode('utf-8'))
+        self.version = [tuple(v) for v in self.tables['version']]
+        self.root_header = self.tables['root_header']
+
+        self.words = WordList(self)
+        self.positions = WordPositions(self)
+        self.root_words = SharedRoots(self, cache_size)
+
+    @staticmethod
+    def is_current(shared_path, version):
+        """True if shared_path exists and was published from this dictionary version."""
+        try:
+            lexicon = SharedLexicon(shared_path)
+        except (OSError, ValueError, struct.error):
+            return False
+        current = lexicon.version == [tuple(v) for v in version]
+        lexicon.close()
+        return current
+
+    def close(self):
+        # Views (and arrays) must be released before the mapping can be closed
+        self._columns = []
+        for view in (self._offsets, self._by_word, self._view):
+            view.release()
+        self._mm.close()
+        self._file.close()
+
+    # --- RECORD ACCESS ---
+    def _record(self, i):
+        start = self._blob_off + self._offsets[i]
+        end = self._blob_off + self._offsets[i + 1]
+        return self._mm[start:end]
+
+    def word(self, i):
+        return self._record(i).split(SEP, 1)[0].decode('utf-8')
+
+    def find(self, word):
+        """Record id of a root word (binary search), or -1."""
+        key = word.encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(self._by_word[mid]).split(SEP, 1)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._record(self._by_word[lo]).split(SEP, 1)[0] == key:
+            return self._by_word[lo]
+        return -1
+
+    def row(self, i):
+        fields = [field.decode('utf-8') for field in self._record(i).split(SEP)[1:]]
+        return MappingProxyType({k: tuple(v) if isinstance(v, list) else v
+                                 for k, v in row_dict(self.root_header, fields).items()})
+
+    # --- BUILDER TABLES ---
+    def rules(self):
+        """(sandhi_rules, vibhakti_markers, samasa_rules) as the builder reads them from CSV."""
+        sandhi_header, sandhi = self.tables['sandhi']
+        marker_header, markers = self.tables['markers']
+        samasa_header, samasa = self.tables['samasa']
+        return (
+            [row_dict(sandhi_header, fields) for fields in sandhi],
+            {key: row_dict(marker_header, fields) for key, fields in markers},
+            [row_dict(samasa_header, fields) for fields in samasa],
+        )
+
+    def features(self):
+        """LexiconFeatures whose columns are zero-copy views of the file."""
+        vocab = self.tables['vocab']
+        return LexiconFeatures.from_columns(
+            self.words, self.positions,
+            [tuple(vocab[column]) for column in FEATURE_COLUMNS[:3]],
+            self._columns,
+        )
+
+class WordList(Sequence):
+    def __init__(self, lexicon):
+        """Root words in dictionary order, decoded on access (the fuzzy matcher's word list)."""
+        self.lexicon = lexicon
+
+    def __len__(self):
+        return self.lexicon.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.lexicon.word(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.lexicon.word(i)
+
+    def __iter__(self):
+        return (self.lexicon.word(i) for i in range(len(self)))
+
+class WordPositions(Mapping):
+    def __init__(self, lexicon):
+        """word -> row number in the feature columns."""
+        self.lexicon = lexicon
+
+    def __getitem__(self, word):
+        i = self.lexicon.find(word)
+        if i < 0:
+            raise KeyError(word)
+        return i
+
+    def __len__(self):
+        return self.lexicon.count
+
+    def __iter__(self):
+        return iter(self.lexicon.words)
+
+class SharedRoots(Mapping):
+    def __init__(self, lexicon, cache_size=4096):
+        """The builder's root_words over the mapped file: word -> read-only row."""
+        self.lexicon = lexicon
+        self._cache = StripedCache(cache_size)
+
+    def _fetch(self, word):
+        i = self.lexicon.find(word)
+        return self.lexicon.row(i) if i >= 0 else None
+
+    def __getitem__(self, word):
+        row = self._cache.get_or_compute(word, self._fetch)
+        if row is None:
+            raise KeyError(word)
+        return row
+
+    def __contains__(self, word):
+        return self._cache.get_or_compute(word, self._fetch) is not None
+
+    def __len__(self):
+        return self.lexicon.count
+
+    def __iter__(self):
+        return iter(self.lexicon.words)
+
+def attach_builder(shared_path, dict_dir=None):
+    """
+    Worker entry point: a builder over the published file, publishing it first
+    when it is missing or was built from another dictionary version.
+    """
+    from word_joiner import KannadaWordBuilder, dictionary_version  # Local: word_joiner imports this module
+    dict_dir = dict_dir or KannadaWordBuilder.default_dict_dir()
+    version = dictionary_version(dict_dir)
+    if not SharedLexicon.is_current(shared_path, version):
+        publish(KannadaWordBuilder(dict_dir), shared_path, version)
+    return KannadaWordBuilder(dict_dir, shared_path=shared_path)
+
+# --- WORKER FOOTPRINT BENCHMARK ---
+def _memory_kb():
+    """{'rss', 'pss', 'private'} of this process in KB (Linux); pss splits shared pages between their users."""
+    usage = {'rss': 0, 'pss': 0, 'private': 0}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    usage[key.lower()] = int(value.split()[0])
+                elif key in ('Private_Clean', 'Private_Dirty'):
+                    usage['private'] += int(value.split()[0])
+    except OSError:
+        import resource
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+def _worker(mode, shared_path):
+    from word_joiner import KannadaWordBuilder
+    started = time.perf_counter()
+    if mode == 'shared':
+        builder = KannadaWordBuilder(shared_path=shared_path)
+    else:
+        builder = KannadaWordBuilder()
+    start_s = time.perf_counter() - started
+    # Touch the tables the way a serving worker does
+    for word in list(builder.root_words)[:2000]:
+        builder.join_words(word, 'ಗೆ')
+    builder.features.select(min_length=2)
+    print('ready', flush=True)
+    sys.stdin.readline()  # Measure only once every worker is up, so mapped pages count as shared
+    print(json.dumps({'start_s': round(start_s, 4), **_memory_kb()}), flush=True)
+
+def bench(workers, shared_path):
+    """Starts `workers` processes per mode and reports mean start time and memory per worker."""
+    from word_joiner import KannadaWordBuilder, dictionary_version
+    dict_dir = KannadaWordBuilder.default_dict_dir()
+    publish(KannadaWordBuilder(dict_dir), shared_path, dictionary_version(dict_dir))
+    report = {}
+    for mode in ('private', 'shared'):
+        procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), 'worker', mode, shared_path],
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(workers)]
+        for proc in procs:
+            proc.stdout.readline()
+        results = []
+        for proc in procs:
+            out, _ = proc.communicate('\n')
+            results.append(json.loads(out))
+        report[mode] = {key: round(sum(r[key] for r in results) / len(results), 4)
+                        for key in ('start_s', 'rss', 'pss', 'private')}
+    return report
+
+def main():
+    usage = (f"Usage: python {os.path.basename(__file__)} publish <lexicon.shm> [dictionaries_dir]\n"
+             f"       python {os.path.basename(__file__)} bench <lexicon.shm> [workers]")
+    if len(sys.argv) == 4 and sys.argv[1] == 'worker':
+        _worker(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == 'publish':
+        from word_joiner import KannadaWordBuilder, dictionary_version
+        dict_dir = sys.argv[3] if len(sys.argv) == 4 else KannadaWordBuilder.default_dict_dir()
+        publish(KannadaWordBuilder(dict_dir), sys.argv[2], dictionary_version(dict_dir))
+        print(f"✅ Published {dict_dir} -> {sys.argv[2]} ({os.path.getsize(sys.argv[2])} bytes)")
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == 'bench':
+        workers = int(sys.argv[3]) if len(sys.argv) == 4 else 4
+        print(json.dumps(bench(workers, sys.argv[2]), indent=2))
+    else:
+        print(usage)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
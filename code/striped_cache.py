@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+class StripedCache:
+    def __init__(self, max_size=65536, stripes=16):
+        """
+        Bounded LRU cache split into independently locked stripes.
+        Threads touching different keys rarely wait on each other, which matters
+        once the GIL is gone (free-threaded CPython).
+        """
+        stripes = 1 << max(0, (stripes - 1).bit_length())  # Round up to a power of two
+        self._mask = stripes - 1
+        self._per_stripe = max(1, max_size // stripes)
+        self._maps = [OrderedDict() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, key):
+        return hash(key) & self._mask
+
+    def get(self, key, default=None):
+        i = self._stripe(key)
+        with self._locks[i]:
+            stripe = self._maps[i]
+            if key in stripe:
+                stripe.move_to_end(key)
+                return stripe[key]
+        return default
+
+    def put(self, key, value):
+        i = self._stripe(key)
+        with self._locks[i]:
+            stripe = self._maps[i]
+            stripe[key] = value
+            stripe.move_to_end(key)
+            if len(stripe) > self._per_stripe:
+                stripe.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value, computing it outside the lock on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        for lock, stripe in zip(self._locks, self._maps):
+            with lock:
+                stripe.clear()
+
+    def __len__(self):
+        return sum(len(stripe) for stripe in self._maps)
@@ -0,0 +1,140 @@
+import re
+import sys
+import time
+import unicodedata
+from akshara import CONSONANT, DIGIT, HALANT, KANNADA_END, KANNADA_START, MATRA, VOWEL, ZWJ, ZWNJ, char_class
+from striped_cache import StripedCache
+
+NUKTA = '಼'
+DIGIT_ZERO = '೦'  # ೦, often typed for the anusvara ಂ (ಬೆ೦ಗಳೂರು)
+ANUSVARA = 'ಂ'
+
+# Invisible characters pasted along with words (zero width space, BOM, soft hyphen, word joiner)
+INVISIBLE = {0x200b: None, 0xfeff: None, 0x00ad: None, 0x2060: None}
+# Every other kind of space (tab, no-break, thin ...) reads as a plain space
+SPACES = {ord(c): ' ' for c in '\t\n\r\x0b\x0c\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+          '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'}
+# One precompiled table for the character-level fixes: invisibles dropped, spaces unified
+TRANSLATE = str.maketrans({**INVISIBLE, **SPACES})
+
+# Characters normalize_input() may rewrite; text without any of them (and already NFC,
+# with single inner spaces) is returned as is
+_SUSPECT = re.compile('[%s]' % re.escape(''.join(map(chr, TRANSLATE)) + ZWNJ + ZWJ + DIGIT_ZERO + NUKTA)).search
+
+PLACEHOLDERS = frozenset({'TODO', 'todo', 'TBD', '?', '-'})
+
+def _fix_marks(text):
+    # ೦ between letters -> anusvara; ZWNJ / ZWJ kept once, right after a virama;
+    # nukta kept once, right after its consonant (ಜೆ಼ -> ಜ಼ೆ, NFC does not move it past a vowel sign)
+    out = []
+    for char in text:
+        if char == NUKTA:
+            i = len(out)
+            while i and char_class(out[i - 1]) == MATRA:
+                i -= 1
+            if i and char_class(out[i - 1]) == CONSONANT:
+                out.insert(i, char)
+            continue
+        if char == DIGIT_ZERO and out and char_class(out[-1]) in (VOWEL, CONSONANT, MATRA):
+            char = ANUSVARA
+        if char == ZWNJ or char == ZWJ:
+            if not out or out[-1] != HALANT:
+                continue
+        out.append(char)
+    return ''.join(out)
+
+def _normalize(text):
+    text = unicodedata.normalize('NFC', text.translate(TRANSLATE))
+    if ZWNJ in text or ZWJ in text or DIGIT_ZERO in text or NUKTA in text:
+        text = _fix_marks(text)
+    return ' '.join(text.split())
+
+_cache = StripedCache(65536)
+
+def normalize_input(text):
+    """
+    Canonical form of user input, applied by every public lookup (join_words, hints, suggestions):
+        - whitespace trimmed and collapsed, invisible characters removed, NFC
+        - nukta kept (ಜ಼ and ಜ are different sounds), once and right after its consonant
+        - ೦ between letters read as the anusvara ಂ
+        - ZWNJ / ZWJ kept only once, right after a virama (ಮಹಲ್‌ಗೆ); stray joiners removed
+    Lexicon keys are built with the same rules (normalize_word), so queries and keys agree.
+    Clean input (ASCII, or NFC Kannada with nothing to fix) is returned unchanged without
+    allocating; everything else goes through a bounded cache.
+    """
+    if not text:
+        return ''
+    if (_SUSPECT(text) is None and (' ' not in text or text[0] != ' ' != text[-1] and '  ' not in text)
+            and (text.isascii() or unicodedata.is_normalized('NFC', text))):
+        return text
+    return _cache.get_or_compute(text, _normalize)
+
+def normalize_word(word):
+    """
+    Canonical spelling of one dictionary word (same rules as normalize_input). Every lexicon
+    key is built with it: root words at load, the SQLite key columns, the compound store,
+    and through the builder the shared lexicon and the FST.
+    """
+    return normalize_input(word)
+
+def word_problem(word):
+    """
+    Why a (normalized) word is not a dictionary word, or None:
+    'empty', 'placeholder', 'non_kannada', 'digits' or 'starts_with_sign'.
+    """
+    if not word:
+        return 'empty'
+    if word in PLACEHOLDERS:
+        return 'placeholder'
+    for char in word:
+        code = ord(char)
+        if not (KANNADA_START <= code <= KANNADA_END or char == ZWNJ or char == ZWJ):
+            return 'non_kannada'
+        if char_class(char) == DIGIT:
+            return 'digits'
+    if char_class(word[0]) not in (VOWEL, CONSONANT):
+        return 'starts_with_sign'
+    return None
+
+# --- BENCHMARK ---
+def _per_call(fn, items, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e9
+
+def benchmark(n=20000):
+    """Nanoseconds per call of normalize_input on clean and dirty input, and what it adds to join_words."""
+    import random
+    from word_joiner import KannadaWordBuilder
+    builder = KannadaWordBuilder()
+    rng = random.Random(7)
+    words = rng.choices(list(builder.root_words), k=n)
+    dirty = [' ' + w + '\u200b' for w in words]
+    results = {
+        'clean_kannada': _per_call(normalize_input, words),
+        'ascii': _per_call(normalize_input, ['word%d' % (i % 500) for i in range(n)]),
+        'dirty_cached': _per_call(normalize_input, dirty),
+        'dirty_uncached': _per_call(_normalize, dirty),
+    }
+    markers = list(builder.paradigm_markers)
+    pairs = [(w, rng.choice(markers)) for w in words]
+    join_raw = _per_call(lambda p: builder.validator.validate_join(p[0], p[1], builder._join(p[0], p[1])), pairs)
+    join = _per_call(lambda p: builder.join_words(p[0], p[1]), pairs)
+    results['join_words'] = join
+    results['join_words_overhead'] = join - join_raw
+    return results
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"--- ⏱️ Input normalization ({n} calls per case) ---")
+    results = benchmark(n)
+    for case, ns in results.items():
+        print(f"   {case:>20}: {ns:8.0f} ns/call")
+    print("✅ Done")
+
+if __name__ == "__main__":
+    main()
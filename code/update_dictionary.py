@@ -1,55 +1,30 @@
 import csv
 import os
 import shutil
+from akshara import HALANT, MATRA_TO_SWARA, segment
 
 # Kannada Unicode Mapping for Vowels (Swaras)
 # This maps the "Vowel Sign" (Matra) to the actual Vowel Sound
-SWARA_MAP = {
-    '\u0cbe': 'ಆ',  # aa
-    '\u0cbf': 'ಇ',  # i
-    '\u0cc0': 'ಈ',  # ii
-    '\u0cc1': 'ಉ',  # u
-    '\u0cc2': 'ಊ',  # uu
-    '\u0cc3': 'ಋ',  # ru
-    '\u0cc4': 'ೠ',  # ruu
-    '\u0cc6': 'ಎ',  # e
-    '\u0cc7': 'ಏ',  # ee
-    '\u0cc8': 'ಐ',  # ai
-    '\u0cca': 'ಒ',  # o
-    '\u0ccb': 'ಓ',  # oo
-    '\u0ccc': 'ಔ',  # au
-}
-
-HALANT = '\u0ccd' # The symbol that removes the inherent 'a'
+SWARA_MAP = MATRA_TO_SWARA
 
 def get_kannada_last_sound(word):
     """
-    Analyzes the last character of a Kannada word to find its ending sound.
+    Analyzes the last akshara of a Kannada word to find its ending sound.
     """
     if not word:
         return ""
     
-    last_char = word[-1]
-    
-    # Case 1: Word ends with a Matra (Vowel Sign)
-    if last_char in SWARA_MAP:
-        return SWARA_MAP[last_char]
+    seg = segment(word)
     
-    # Case 2: Word ends with Halant (Virama)
+    # Case 1: Word ends with Halant (Virama), possibly followed by ZWNJ
     # This means it ends in a consonant sound (Vyanjana)
-    if last_char == HALANT:
+    if seg.last_swara == HALANT:
         # Return the consonant before the halant
-        if len(word) > 1:
-            return word[-2] # Returns the consonant itself
-        return "consonant"
+        return seg.last_consonant or "consonant"
 
-    # Case 3: Word ends in a base Consonant
-    # In Kannada, a base consonant (like ಕ) implies an inherent 'ಅ' (a) sound.
-    # Unless it is a standalone vowel (like ಅ, ಆ)
-    if '\u0c80' <= last_char <= '\u0c94': # It's a standalone vowel
-        return last_char
-    else:
-        return 'ಅ' # Inherent 'a' sound
+    # Case 2: Word ends with a Matra, a standalone vowel or Anusvara/Visarga.
+    # A base consonant (like ಕ) implies an inherent 'ಅ' (a) sound.
+    return seg.last_swara
 
 def update_csv_data():
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
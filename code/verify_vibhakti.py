@@ -1,3 +1,4 @@
+from akshara import AksharaSegmenter
 from word_joiner import KannadaWordBuilder
 
 def test_vibhakti():
@@ -81,5 +82,49 @@ def test_vibhakti():
 
     print(f"\nScore: {passed}/{len(test_cases)}")
 
+def test_akshara():
+    print("--- Testing Akshara Segmentation ---")
+    segmenter = AksharaSegmenter()
+
+    test_cases = [
+    # === AKSHARAS (conjuncts, ZWNJ, yogavaha stay in their cluster) ===
+    ("aksharas", "ಮಹಲ್\u200cಗೆ", ["ಮ", "ಹ", "ಲ್\u200c", "ಗೆ"]),   # ZWNJ closes the halant akshara
+    ("aksharas", "ಕ್ಷತ್ರಿಯ", ["ಕ್ಷ", "ತ್ರಿ", "ಯ"]),              # conjuncts
+    ("aksharas", "ಶ್ರೀ", ["ಶ್ರೀ"]),                         # conjunct + long vowel sign
+    ("aksharas", "ಕನ್ನಡ", ["ಕ", "ನ್ನ", "ಡ"]),                # double consonant
+    ("aksharas", "ಅಂತಃ", ["ಅಂ", "ತಃ"]),                     # anusvara / visarga
+
+    # === LAST SOUND (vowel of the last akshara) ===
+    ("last_swara", "ಮಹಲ್\u200cಗೆ", "ಎ"),
+    ("last_swara", "ಕ್ಷತ್ರಿಯ", "ಅ"),                          # inherent 'a'
+    ("last_swara", "ಶ್ರೀ", "ಈ"),
+    ("last_swara", "ಸಂ", "ಂ"),                               # anusvara ending
+    ("last_swara", "ಅಂತಃ", "ಃ"),                             # visarga ending
+    ("last_swara", "ಹೊಸ್", "್"),                              # dead consonant
+    ("last_swara", "ಮಹಲ್\u200c", "್"),                       # explicit halant form
+
+    # === FIRST SOUND ===
+    ("first_swara", "ಕ್ಷತ್ರಿಯ", "ಕ"),
+    ("first_swara", "ಅಂತಃ", "ಅ"),
+
+    # === STRIP VOWEL SIGN (Lopa) ===
+    ("strip_vowel_sign", "ಮಹಲ್\u200c", "ಮಹಲ"),               # halant and its ZWNJ removed
+    ("strip_vowel_sign", "ಮನೆ", "ಮನ"),
+    ("strip_vowel_sign", "ಹೊಸ್", "ಹೊಸ"),
+    ("strip_vowel_sign", "ಕ್ಷತ್ರಿಯ", "ಕ್ಷತ್ರಿಯ"),                 # bare consonant: unchanged
+]
+
+    passed = 0
+    for method, word, expected in test_cases:
+        res = getattr(segmenter, method)(word)
+        if res == expected:
+            print(f"✅ PASS: {method}({word}) -> {res}")
+            passed += 1
+        else:
+            print(f"❌ FAIL: {method}({word}) -> {res} (Expected: {expected})")
+
+    print(f"\nScore: {passed}/{len(test_cases)}")
+
 if __name__ == "__main__":
-    test_vibhakti()
\ No newline at end of file
+    test_vibhakti()
+    test_akshara()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import csv
+import os
+import re
+import sys
+from akshara import CONSONANT, HALANT, char_class
+from striped_cache import StripedCache
+from text_normalizer import normalize_input
+from word_joiner import AGAMA_MARKERS, KannadaWordBuilder
+
+# Kannada words (ZWJ/ZWNJ kept inside the token)
+TOKEN_REGEX = re.compile(r"[\u0C80-\u0CFF\u200c\u200d]+")
+
+# One probe stem per ending sound, used to read off what _apply_vibhakti appends
+PROBES = {
+    'ಅ': 'ಕಟ', 'ಆ': 'ಕಟಾ', 'ಇ': 'ಕಟಿ', 'ಈ': 'ಕಟೀ', 'ಉ': 'ಕಟು', 'ಊ': 'ಕಟೂ',
+    'ಎ': 'ಕಟೆ', 'ಏ': 'ಕಟೇ', 'ಐ': 'ಕಟೈ', 'ಒ': 'ಕಟೊ', 'ಓ': 'ಕಟೋ', 'ಔ': 'ಕಟೌ',
+    '್': 'ಕಟ್', 'ಂ': 'ಕಟಂ', 'ಃ': 'ಕಟಃ',
+}
+
+def sound_class(sound):
+    """
+    Ending sound as PROBES keys it. root_words.csv stores the final consonant as the
+    last_sound of halant-ending words (ಮಹಾದೇವನ್ -> 'ನ'); _apply_vibhakti treats those
+    like '್', so they share its endings.
+    """
+    if len(sound) == 1 and char_class(sound) == CONSONANT:
+        return HALANT
+    return sound
+
+class SuffixAutomaton:
+    def __init__(self):
+        """
+        Deterministic automaton over reversed suffixes: reading a token right to left,
+        every accepting state passed is a suffix that ends the token.
+        """
+        self.transitions = [{}]   # state -> {char: next_state}
+        self.accepts = [[]]       # state -> [payload, ...]
+
+    def add(self, suffix, payload):
+        state = 0
+        for char in reversed(suffix):
+            nxt = self.transitions[state].get(char)
+            if nxt is None:
+                nxt = len(self.transitions)
+                self.transitions[state][char] = nxt
+                self.transitions.append({})
+                self.accepts.append([])
+            state = nxt
+        self.accepts[state].append(payload)
+
+    def matches(self, token):
+        """Yields (suffix_length, payload) for every known suffix of token, shortest first."""
+        state = 0
+        transitions = self.transitions
+        for depth in range(1, len(token) + 1):
+            state = transitions[state].get(token[-depth])
+            if state is None:
+                return
+            for payload in self.accepts[state]:
+                yield depth, payload
+
+class VibhaktiStemmer:
+    def __init__(self, builder, cache_size=200000):
+        """
+        Reverse of _apply_vibhakti: compiles every surface ending it can produce
+        (ಯಲ್ಲಿ, ದಲ್ಲಿ, ವಿನಿಂದ, ಕ್ಕೆ, ಗಳ... ) into a suffix automaton.
+        """
+        self.builder = builder
+        self.automaton = SuffixAutomaton()
+        self.cache = StripedCache(cache_size)
+        self.forms = self._compile()
+
+    def markers(self):
+        """Case markers in priority order: the builder's paradigm first, then the particles."""
+        return list(dict.fromkeys((*self.builder.paradigm_markers, *AGAMA_MARKERS)))
+
+    def _compile(self):
+        forms = []
+        seen = set()
+        for marker in self.markers():
+            for sound, probe in PROBES.items():
+                # The sound is passed in: lexicon roots keep their CSV last_sound (ಐ, ಂ ...)
+                # even where the spelled-out probe would be read as another class
+                surface = self.builder._apply_vibhakti(probe, marker, sound)
+                if not surface.startswith(probe):
+                    continue
+                suffix = surface[len(probe):]
+                key = (suffix, sound)
+                if not suffix or key in seen:
+                    continue  # First marker producing this ending for this sound wins
+                seen.add(key)
+                form = {'suffix': suffix, 'sound': sound, 'marker': marker,
+                        'rule': f"Vibhakti: {marker} ({sound}-ending +{suffix.strip()})"}
+                forms.append(form)
+                self.automaton.add(suffix, form)
+        return forms
+
+    def analyses(self, token):
+        """
+        All (root, marker) readings of an inflected token, best first:
+        lexicon roots before unknown ones, longer suffixes before shorter.
+        """
+        found = []
+        for length, form in self.automaton.matches(token):
+            root = token[:-length]
+            if not root or sound_class(self.builder._get_last_swara(root)) != form['sound']:
+                continue
+            found.append({
+                'token': token,
+                'root': root,
+                'marker': form['marker'],
+                'rule': form['rule'],
+                'in_lexicon': root in self.builder.root_words,
+            })
+        found.sort(key=lambda a: (not a['in_lexicon'], len(a['root'])))
+        return found
+
+    def stem(self, token, allow_unknown=False):
+        """
+        Best analysis of one token: {'token', 'root', 'marker', 'rule', 'in_lexicon'}.
+        Returns None when no lexicon root fits (or nothing fits, with allow_unknown).
+        """
+        token = normalize_input(token)
+        best = self.cache.get_or_compute(token, lambda t: (self.analyses(t) or [None])[0])
+        if best is None or (not best['in_lexicon'] and not allow_unknown):
+            return None
+        return best
+
+    def stem_text(self, lines, allow_unknown=False):
+        """
+        Tokenizes a stream of text lines and yields one result per Kannada token.
+        Associative 'X ಜೊತೆ' is read as a single two-token form.
+        Yields: (token, analysis or None)
+        """
+        for line in lines:
+            tokens = TOKEN_REGEX.findall(line)
+            i = 0
+            while i < len(tokens):
+                token = tokens[i]
+                if i + 1 < len(tokens) and tokens[i + 1] == 'ಜೊತೆ':
+                    joined = self.stem(token + ' ಜೊತೆ', allow_unknown)
+                    if joined:
+                        yield token + ' ಜೊತೆ', joined
+                        i += 2
+                        continue
+                yield token, self.stem(token, allow_unknown)
+                i += 1
+
+def stem_file(input_path, output_path):
+    builder = KannadaWordBuilder()
+    stemmer = VibhaktiStemmer(builder)
+    print(f"--- ✂️ Stemming {input_path} ({len(stemmer.forms)} compiled endings) ---")
+
+    total = stemmed = 0
+    with open(input_path, 'r', encoding='utf-8-sig') as src, \
+         open(output_path, 'w', newline='', encoding='utf-8-sig') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(["token", "root", "marker", "rule"])
+        for token, analysis in stemmer.stem_text(src):
+            total += 1
+            if analysis:
+                stemmed += 1
+                writer.writerow([token, analysis['root'], analysis['marker'], analysis['rule']])
+            else:
+                writer.writerow([token, "", "", ""])
+    print(f"✅ Stemmed {stemmed}/{total} tokens -> {output_path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python {os.path.basename(__file__)} <text.txt> <stems.csv>")
+        sys.exit(1)
+    stem_file(sys.argv[1], sys.argv[2])
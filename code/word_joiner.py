@@ -1,26 +1,130 @@
+import copy
 import csv
 import os
+import threading
+from types import MappingProxyType
+from akshara import AksharaSegmenter, is_vowel
+from dictionary_db import DictionaryDB
 from fuzzy_matcher import FuzzyMatcher
 from hint_generator import HintGenerator
+from lexicon_features import LexiconFeatures
+from shared_lexicon import SharedLexicon
+from text_normalizer import normalize_input, normalize_word
+from word_validator import LexiconValidator
+
+# Markers that start with vowels usually trigger Agama (alli, inda, annu, olage, particle 'ee'/'oo')
+AGAMA_MARKERS = ('ಅಲ್ಲಿ', 'ಇಂದ', 'ಅನ್ನು', 'ಒಳಗೆ', 'ಏ', 'ಓ')
+# Plural case forms (start with 'gala') - appended directly
+PLURAL_MARKERS = ('ಗಳು', 'ಗಳ', 'ಗಳನ್ನು', 'ಗಳಿಗೆ', 'ಗಳಲ್ಲಿ', 'ಗಳಿಂದ', 'ಗಳೊಳಗೆ')
+
+DICTIONARY_FILES = ('root_words.csv', 'sandhi_rules.csv', 'vibhakti_rules.csv', 'samasa_rules.csv', 'compound_words.csv')
+PROFILE_FILES = ('sandhi_rules.csv', 'vibhakti_rules.csv', 'samasa_rules.csv')
+# Endings no sandhi / vibhakti rule is keyed on (vowel signs ai, au, vocalic r/l; anusvara, visarga):
+# rule lookup reads them as the inherent 'ಅ' (ಕೈ + ಅಲ್ಲಿ -> ಕೈದಲ್ಲಿ). The segmenter still reports the real sound.
+UNRULED_ENDINGS = frozenset('ೈೌೃೄೢೣಂಃ')
+PROFILES_DIR = 'profiles'  # dictionaries/profiles/<name>/ holds one overlay per profile
+STANDARD_PROFILE = 'standard'
+
+def dictionary_files(dict_dir):
+    """Every CSV the builder reads from a dictionaries folder (relative paths, profiles included)."""
+    files = list(DICTIONARY_FILES)
+    profiles_dir = os.path.join(dict_dir, PROFILES_DIR)
+    if os.path.isdir(profiles_dir):
+        for name in sorted(os.listdir(profiles_dir)):
+            files += [os.path.join(PROFILES_DIR, name, f) for f in PROFILE_FILES]
+    return [f for f in files if os.path.exists(os.path.join(dict_dir, f))]
+
+def dictionary_version(dict_dir):
+    """Cheap version stamp of a dictionaries folder: (file, size, mtime) for every CSV the builder reads."""
+    version = []
+    for filename in dictionary_files(dict_dir):
+        stat = os.stat(os.path.join(dict_dir, filename))
+        version.append((filename, stat.st_size, stat.st_mtime_ns))
+    return tuple(version)
 
 class KannadaWordBuilder:
-    def __init__(self):
+    def __init__(self, dict_dir=None, db_path=None, shared_path=None):
+        # Defaults to the repo's dictionaries/ folder; pass another folder to load a different version
+        self.dict_dir = dict_dir or self.default_dict_dir()
+        # Optional SQLite dictionary (dictionary_db.py): roots and compounds are queried, not loaded
+        self.db = DictionaryDB(db_path) if db_path else None
+        # Optional published lexicon (shared_lexicon.py): mapped read-only, one copy for all worker processes
+        self.shared = SharedLexicon(shared_path) if shared_path else None
         self.root_words = {}   
         self.sandhi_rules = [] 
         self.vibhakti_markers = {} 
         self.samasa_rules = []
-        self.fuzzy_engine = None
-        self.hint_engine = HintGenerator()
+        # Whole-lexicon engines; profile views share this dict, so each engine exists once
+        self._engines = {'fuzzy': None, 'features': None}
+        self._lazy_lock = threading.Lock()
+        self.profile_name = STANDARD_PROFILE
+        self.profiles = {}  # name -> overlay view sharing this builder's lexicon and engines
+        self.hint_engine = HintGenerator(self.dict_dir, store=self.db.compounds if self.db else None)
         
         self._load_data()
+        self._freeze()
+        # Full declension: CSV case markers, plural 'gala' forms and associative 'jote'
+        self.paradigm_markers = tuple(dict.fromkeys((*self.vibhakti_markers, *PLURAL_MARKERS, 'ಜೊತೆ')))
+        self._paradigms = {}  # last sound -> ((marker, suffix), ...)
+        # A database or shared lexicon is segmented on demand instead of up front
+        in_memory = self.db is None and self.shared is None
+        self.segmenter = AksharaSegmenter(self.root_words if in_memory else ())
         
-        if self.root_words:
-            self.fuzzy_engine = FuzzyMatcher(list(self.root_words.keys()))
+        if self.shared is not None:
+            # Views of the mapped file: nothing is copied or recomputed per process
+            self._engines['fuzzy'] = FuzzyMatcher(self.shared.words)
+            self._engines['features'] = self.shared.features()
+        elif self.root_words and in_memory:
+            self._engines['fuzzy'] = FuzzyMatcher(tuple(self.root_words.keys()))
+            # Columnar NumPy view for bulk filtering / statistics
+            self._engines['features'] = LexiconFeatures(self.root_words, self._get_last_swara, self.segmenter)
+
+        # Known words: roots + 'combined' column of compound_words.csv (via the compound store)
+        self.validator = LexiconValidator(
+            self.root_words,
+            self.hint_engine.store or (),
+            self.vibhakti_markers,
+        )
+        self._load_profiles()
+
+    # --- WHOLE-LEXICON ENGINES (built on first use for a database lexicon) ---
+    def _engine(self, name, build):
+        engines = self._engines
+        if engines[name] is None and self.db is not None and self.root_words:
+            with self._lazy_lock:
+                if engines[name] is None:
+                    engines[name] = build()
+        return engines[name]
+
+    @property
+    def fuzzy_engine(self):
+        return self._engine('fuzzy', lambda: FuzzyMatcher(tuple(self.root_words.keys())))
+
+    @property
+    def features(self):
+        return self._engine('features', lambda: LexiconFeatures(self.root_words, self._get_last_swara, self.segmenter))
+
+    @staticmethod
+    def default_dict_dir():
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_dir, 'dictionaries')
 
     def _load_data(self):
         """Loads CSV data into memory"""
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        dict_dir = os.path.join(base_dir, 'dictionaries')
+        dict_dir = self.dict_dir
+
+        if self.db is not None:
+            # Rule tables are small and loaded; root words stay in the database
+            self.root_words = self.db.root_words()
+            self.sandhi_rules = self.db.rows('sandhi')
+            self.vibhakti_markers = self.db.markers()
+            self.samasa_rules = self.db.rows('samasa')
+            return
+
+        if self.shared is not None:
+            self.root_words = self.shared.root_words
+            self.sandhi_rules, self.vibhakti_markers, self.samasa_rules = self.shared.rules()
+            return
 
         # Load all CSVs (Root, Sandhi, Vibhakti, Samasa)
         # [Same loading logic as before - abbreviated for clarity]
@@ -30,7 +134,10 @@ class KannadaWordBuilder:
             'vibhakti_rules.csv': self.vibhakti_markers,
             'samasa_rules.csv': self.samasa_rules
         }
-        
+        self._read_tables(dict_dir, files)
+
+    @staticmethod
+    def _read_tables(dict_dir, files):
         for filename, target in files.items():
             path = os.path.join(dict_dir, filename)
             if os.path.exists(path):
@@ -38,11 +145,77 @@ class KannadaWordBuilder:
                     reader = csv.DictReader(f)
                     for row in reader:
                         if isinstance(target, dict):
-                            key = 'word' if 'word' in row else 'marker'
-                            target[row[key]] = row
+                            # Keys are spelled the way join_words() normalizes its inputs
+                            key = row['word' if 'word' in row else 'marker']
+                            target[normalize_word(key) if key else key] = row
                         else:
                             target.append(row)
 
+    @staticmethod
+    def _frozen_row(row):
+        # Extra CSV columns come back as a list under the None key
+        return MappingProxyType({k: tuple(v) if isinstance(v, list) else v for k, v in row.items()})
+
+    def _freeze(self):
+        """
+        Makes the loaded tables read-only (mapping proxies and tuples), so a single
+        builder can be shared by concurrent sessions/threads without locking.
+        """
+        if self.db is None and self.shared is None:
+            self.root_words = MappingProxyType({k: self._frozen_row(v) for k, v in self.root_words.items()})
+        self.sandhi_rules = tuple(self._frozen_row(row) for row in self.sandhi_rules)
+        self.vibhakti_markers = MappingProxyType({k: self._frozen_row(v) for k, v in self.vibhakti_markers.items()})
+        self.samasa_rules = tuple(self._frozen_row(row) for row in self.samasa_rules)
+
+    # --- PROFILES (copy-on-write overlays) ---
+    def _load_profiles(self):
+        profiles_dir = os.path.join(self.dict_dir, PROFILES_DIR)
+        if os.path.isdir(profiles_dir):
+            for name in sorted(os.listdir(profiles_dir)):
+                if os.path.isdir(os.path.join(profiles_dir, name)):
+                    self.load_profile(name, os.path.join(profiles_dir, name))
+
+    def load_profile(self, name, profile_dir):
+        """Registers a profile from a folder with any of sandhi_rules.csv / vibhakti_rules.csv / samasa_rules.csv."""
+        sandhi_rules, vibhakti_markers, samasa_rules = [], {}, []
+        self._read_tables(profile_dir, dict(zip(PROFILE_FILES, (sandhi_rules, vibhakti_markers, samasa_rules))))
+        return self.add_profile(name, sandhi_rules, vibhakti_markers, samasa_rules)
+
+    def add_profile(self, name, sandhi_rules=(), vibhakti_markers=None, samasa_rules=()):
+        """
+        Layers extra/overriding rules over this (base) builder and registers the result as `name`.
+        The view is a shallow copy: lexicon, segmenter, fuzzy matcher and hint store are shared,
+        only the three small rule tables are rebuilt. Overlay rules come first, so they win
+        both exact and sound matches; overlay markers replace base markers with the same key.
+        """
+        if name == STANDARD_PROFILE:
+            raise ValueError(f"'{STANDARD_PROFILE}' is the base rule set and cannot be overlaid")
+        view = copy.copy(self)
+        view.sandhi_rules = tuple(self._frozen_row(row) for row in sandhi_rules) + self.sandhi_rules
+        view.samasa_rules = tuple(self._frozen_row(row) for row in samasa_rules) + self.samasa_rules
+        if vibhakti_markers:
+            overlay = {k: self._frozen_row(v) for k, v in vibhakti_markers.items()}
+            view.vibhakti_markers = MappingProxyType({**self.vibhakti_markers, **overlay})
+            view.paradigm_markers = tuple(dict.fromkeys((*view.vibhakti_markers, *PLURAL_MARKERS, 'ಜೊತೆ')))
+            view._paradigms = {}
+            view.validator = copy.copy(self.validator)
+            view.validator.markers = self.validator.markers | frozenset(overlay)
+        view.profile_name = name
+        self.profiles[name] = view
+        return view
+
+    def profile(self, name=None):
+        """The builder for a profile name (None / 'standard' -> the base rules)."""
+        if name is None or name == STANDARD_PROFILE:
+            return self
+        if name not in self.profiles:
+            raise KeyError(f"Unknown profile: {name}")
+        return self.profiles[name]
+
+    @property
+    def profile_names(self):
+        return (STANDARD_PROFILE, *self.profiles)
+
     # --- SOUND HELPERS ---
     def _get_last_swara(self, word):
         if not word: return ''
@@ -50,23 +223,22 @@ class KannadaWordBuilder:
         if word in self.root_words and self.root_words[word].get('last_sound', 'TODO') not in ['TODO', '']:
              return self.root_words[word]['last_sound']
         
-        swaras = {'ಾ': 'ಆ', 'ಿ': 'ಇ', 'ೀ': 'ಈ', 'ು': 'ಉ', 'ೂ': 'ಊ', 'ೆ': 'ಎ', 'ೇ': 'ಏ', 'ೊ': 'ಒ', 'ೋ': 'ಓ'}
-        if word[-1] in swaras: return swaras[word[-1]]
-        if 'ಅ' <= word[-1] <= 'ಔ': return word[-1]
-        if word[-1] == '್': return '್'
-        return 'ಅ'
+        if word[-1] in UNRULED_ENDINGS:
+            return 'ಅ'
+        # Vowel of the last akshara (handles conjuncts and ZWNJ)
+        return self.segmenter.last_swara(word)
 
     def _get_first_swara(self, word):
         if not word: return ''
-        char = word[0]
-        if 'ಅ' <= char <= 'ಔ': return char
-        return char
+        return self.segmenter.first_swara(word)
 
     # --- SAMASA LOGIC ---
-    def _resolve_samasa(self, word1):
-        for rule in self.samasa_rules:
+    def _resolve_samasa(self, word1, trace=None):
+        for i, rule in enumerate(self.samasa_rules):
             suffix = rule['suffix_to_drop']
             if word1.endswith(suffix):
+                if trace is not None:
+                    trace['samasa_row'] = i
                 base = word1[:-len(suffix)]
                 candidate_root = base
                 if rule['replacement_sound'] == 'ಉ' and not base.endswith('ಉ'):
@@ -75,8 +247,9 @@ class KannadaWordBuilder:
         return None, None
 
     # --- VIBHAKTI LOGIC (FIXED) ---
-    def _apply_vibhakti(self, word, marker):
-        last_sound = self._get_last_swara(word)
+    def _apply_vibhakti(self, word, marker, last_sound=None):
+        if last_sound is None:
+            last_sound = self._get_last_swara(word)
         
         # GROUP 0: Plurals (start with 'ga') - DIRECT APPEND
         # Fixes: Mane + galige -> Manegalige
@@ -105,13 +278,12 @@ class KannadaWordBuilder:
         # Fixes: Mane + jote -> Maneya jote (Requires Genitive first)
         if marker == 'ಜೊತೆ':
             # Recursively apply 'da' (Genitive) logic first, then add ' jote'
-            genitive_form = self._apply_vibhakti(word, 'ದ')
+            genitive_form = self._apply_vibhakti(word, 'ದ', last_sound)
             return genitive_form + " ಜೊತೆ"
 
         # GROUP 4: Agama (alli, inda, annu, olage, particle 'ee'/'oo')
         # Markers that start with vowels usually trigger Agama
-        agama_markers = ['ಅಲ್ಲಿ', 'ಇಂದ', 'ಅನ್ನು', 'ಒಳಗೆ', 'ಏ', 'ಓ']
-        if marker in agama_markers:
+        if marker in AGAMA_MARKERS:
             
             # SUB-RULE: 'u' ending special case for 'inda'/'alli'
             # Fixes: Magu + inda -> Maguvininda (adds 'in')
@@ -152,21 +324,63 @@ class KannadaWordBuilder:
         # Default Fallback
         return word + marker
 
+    # --- DECLENSION (PARADIGM) ---
+    def _paradigm_suffixes(self, last_sound):
+        # Every suffix depends only on the ending sound, so each sound class is worked out once
+        suffixes = self._paradigms.get(last_sound)
+        if suffixes is None:
+            suffixes = tuple((m, self._apply_vibhakti('', m, last_sound)) for m in self.paradigm_markers)
+            self._paradigms[last_sound] = suffixes
+        return suffixes
+
+    def decline(self, word):
+        """
+        All case forms of a word from one sound analysis.
+        Same results as join_words(word, marker) for every marker in paradigm_markers.
+        Returns: {'word', 'last_sound', 'forms': [{'marker', 'result', 'rule'}, ...]}
+        """
+        word = normalize_input(word)
+        last_sound = self._get_last_swara(word)
+        forms = [
+            {'marker': marker, 'result': word + suffix, 'rule': f"Vibhakti: {marker}"}
+            for marker, suffix in self._paradigm_suffixes(last_sound)
+        ]
+        return {'word': word, 'last_sound': last_sound, 'forms': forms}
+
+    def decline_many(self, words=None):
+        """Paradigms for many words (the whole lexicon when words is None), in input order."""
+        if words is None:
+            words = self.root_words.keys()
+        return [self.decline(word) for word in words]
+
     # --- MAIN JOINER ---
-    def join_words(self, word1, word2):
+    def join_words(self, word1, word2, profile=None):
+        builder = self.profile(profile) if profile else self
+        word1, word2 = normalize_input(word1), normalize_input(word2)
+        output = builder._join(word1, word2)
+        # Check inputs and result against the lexicon
+        output['validation'] = builder.validator.validate_join(word1, word2, output)
+        return output
+
+    def _join(self, word1, word2, trace=None):
+        # trace (optional dict) gets the branch that answered and the table rows behind it (rule_profiler.py)
         # 1. CHECK: Is Word 2 a Case Marker?
         # Check explicit list OR generic ending (like 'galu')
         if word2 in self.vibhakti_markers or word2.startswith("ಗಳ"):
+            if trace is not None:
+                trace['branch'] = 'vibhakti' if word2 in self.vibhakti_markers else 'vibhakti_plural'
             result = self._apply_vibhakti(word1, word2)
             return {'result': result, 'status': 'success', 'rule': f"Vibhakti: {word2}"}
 
         # 2. SAMASA CHECK
-        root_word1, samasa_rule = self._resolve_samasa(word1)
+        root_word1, samasa_rule = self._resolve_samasa(word1, trace)
         final_word1 = root_word1 if root_word1 else word1
         
         # 3. EXACT MATCH
-        for rule in self.sandhi_rules:
+        for i, rule in enumerate(self.sandhi_rules):
             if rule['example_word1'] == final_word1 and rule['example_word2'] == word2:
+                if trace is not None:
+                    trace['branch'], trace['sandhi_row'] = 'exact_match', i
                 return {'result': rule['combined_result'], 'status': 'success', 'rule': f"Direct Match (Rule {rule['rule_number']})"}
 
         # 4. PHONETIC SANDHI
@@ -174,26 +388,32 @@ class KannadaWordBuilder:
         sound2 = self._get_first_swara(word2)
         matched_rule = None
 
-        for rule in self.sandhi_rules:
-            if rule['sound1'] == sound1 and rule['sound2'] == sound2:
+        for i, rule in enumerate(self.sandhi_rules):
+            # Rows without a sound pair (profile overlays) are exact-match only
+            if rule['sound1'] and rule['sound2'] and rule['sound1'] == sound1 and rule['sound2'] == sound2:
                 matched_rule = rule
                 break
 
-        if matched_rule:
+        if trace is not None:
+            trace['sounds'] = (sound1, sound2)
+        if matched_rule and word2:
             result_sound = matched_rule['result']
+            if trace is not None:
+                trace['branch'] = 'sandhi_agama' if result_sound in ['ಯ', 'ವ'] else 'sandhi_lopa_guna'
+                trace['sandhi_row'] = i
             # Agama
             if result_sound in ['ಯ', 'ವ']:
-                w2_stub = word2[1:] if 'ಅ' <= word2[0] <= 'ಔ' else word2
+                w2_stub = word2[1:] if is_vowel(word2[0]) else word2
                 vowel_map = {'ಅ':'','ಆ':'ಾ','ಇ':'ಿ','ಈ':'ೀ','ಉ':'ು','ಊ':'ೂ','ಎ':'ೆ','ಏ':'ೇ'}
                 matra = vowel_map.get(sound2, '')
                 final_word = final_word1 + result_sound + matra + w2_stub
             # Lopa/Guna
             else:
-                base_w1 = final_word1
-                if final_word1[-1] in ['ಾ','ಿ','ೀ','ು','ೂ','ೆ','ೇ','ೊ','ೋ','್']:
-                    base_w1 = final_word1[:-1]
+                base_w1 = self.segmenter.strip_vowel_sign(final_word1)
+                if final_word1[-1] in UNRULED_ENDINGS:
+                    base_w1 = final_word1  # Read as an 'ಅ' ending: nothing to drop
                 base_w2 = word2
-                if 'ಅ' <= word2[0] <= 'ಔ': base_w2 = word2[1:]
+                if is_vowel(word2[0]): base_w2 = word2[1:]
                 vowel_to_matra = {
                     'ಆ': 'ಾ', 'ಇ': 'ಿ', 'ಈ': 'ೀ', 'ಉ': 'ು', 'ಊ': 'ೂ', 'ಎ': 'ೆ', 'ಏ': 'ೇ', 'ಐ': 'ೈ', 'ಒ': 'ೊ', 'ಓ': 'ೋ', 'ಔ': 'ೌ', 'ಗ': 'ಗ'
                 }
@@ -202,6 +422,8 @@ class KannadaWordBuilder:
 
             return {'result': final_word, 'status': 'success', 'rule': f"Sandhi Rule: {sound1}+{sound2}={result_sound}"}
 
+        if trace is not None:
+            trace['branch'] = 'fallback'
         return {'result': word1 + word2, 'status': 'warning', 'msg': 'No Sandhi rule found'}
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+import hashlib
+import math
+from bisect import bisect_left
+from collections.abc import Mapping
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        """
+        Fixed-size Bloom filter: no false negatives, ~error_rate false positives.
+        """
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_bits(cls, bits, size, hash_count):
+        """Wraps existing filter bits (e.g. a memory-mapped buffer) without copying."""
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hash_count = hash_count
+        bloom.bits = bits
+        return bloom
+
+    def _positions(self, word):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, word):
+        for pos in self._positions(word):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, word):
+        bits = self.bits
+        for pos in self._positions(word):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+class LexiconValidator:
+    def __init__(self, root_words, compounds=(), markers=()):
+        """
+        root_words: iterable of dictionary words (root_words.csv)
+        compounds:  iterable of known compound words ('combined' column of compound_words.csv),
+                    or a CompoundStore, whose on-disk Bloom filter and index are used directly
+        markers:    vibhakti markers, accepted as a valid second input
+        """
+        # A mapping (the builder's root_words, possibly database-backed) is used as is
+        self.roots = root_words if isinstance(root_words, Mapping) else frozenset(root_words)
+        self.markers = frozenset(markers)
+        self.store = None
+
+        if hasattr(compounds, 'has_combined'):
+            self.store = compounds
+            self.compounds = ()
+            self.bloom = getattr(compounds, 'bloom', None)
+        else:
+            # Sorted array instead of a set keeps multi-million compound lists compact
+            self.compounds = tuple(sorted(set(compounds)))
+
+            # Bloom filter in front of the (large) compound list
+            self.bloom = BloomFilter(len(self.compounds))
+            for word in self.compounds:
+                self.bloom.add(word)
+
+    def _in_compounds(self, word):
+        if self.store is not None:
+            return self.store.has_combined(word)
+        i = bisect_left(self.compounds, word)
+        return i < len(self.compounds) and self.compounds[i] == word
+
+    def lookup(self, word):
+        """
+        Returns where a word is known from: 'root', 'compound' or None.
+        The Bloom filter rejects most unknown words before the binary search.
+        """
+        if not word:
+            return None
+        if word in self.roots:
+            return 'root'
+        if (self.bloom is None or word in self.bloom) and self._in_compounds(word):
+            return 'compound'
+        return None
+
+    def is_known(self, word):
+        return self.lookup(word) is not None
+
+    def validate(self, word):
+        """
+        Validates a single word.
+        Returns: {'word', 'known', 'source', 'confidence'}
+        """
+        source = self.lookup(word)
+        return {
+            'word': word,
+            'known': source is not None,
+            'source': source,
+            'confidence': 'high' if source else 'low',
+        }
+
+    def validate_join(self, word1, word2, output):
+        """
+        Validates the inputs and the result of a join_words() call.
+        confidence:
+            'high'   -> result is a known word
+            'medium' -> both inputs are known and a rule fired (plausible new compound)
+            'low'    -> unknown input(s) or no rule applied
+        """
+        result = output.get('result', '')
+        w1_known = self.is_known(word1)
+        w2_known = word2 in self.markers or self.is_known(word2)
+        result_known = self.is_known(result)
+
+        if result_known:
+            confidence = 'high'
+        elif w1_known and w2_known and output.get('status') == 'success':
+            confidence = 'medium'
+        else:
+            confidence = 'low'
+
+        return {
+            'word1_known': w1_known,
+            'word2_known': w2_known,
+            'result_known': result_known,
+            'confidence': confidence,
+        }